@@ -34,6 +34,18 @@ written to the file::
 
     ../../test/output/BM54.nc
 
+The parsed CTD data are also cached in the netCDF file::
+
+    ../../tamoc/test/output/BM54_ctd.nc
+
+which is read instead of the text file on later runs and rebuilt when the
+text file or this script changes.  The cache stores the data in single 
+precision and packs the fluorescence and oxygen data into 16-bit integers; 
+hence, the data read from the cache differ from those parsed from the text 
+file by about 1e-7 (relative) for temperature, salinity, pressure, and 
+density and by up to about 1e-4 (relative) for fluorescence and oxygen.  If
+the cache cannot be written, the parsed data are used directly.
+
 """
 # S. Socolofsky, July 2013, Texas A&M University <socolofs@tamu.edu>.
 
@@ -44,12 +56,12 @@ from tamoc import ambient
 from tamoc import seawater
 from tamoc import dbm
 
-from netCDF4 import date2num, num2date
-from datetime import datetime
+from functools import partial
 
 import xarray as xr
 
 import numpy as np
+from scipy.interpolate import interp1d
 import matplotlib.pyplot as plt
 import os
 
@@ -69,44 +81,111 @@ def get_ctd_profile():
                                     '../../tamoc/data'))
     dat_file = os.path.join(__location__,'ctd_BM54.cnv')
     
-    # Load in the data using numpy.loadtxt
-    raw = np.loadtxt(dat_file, comments = '#', skiprows = 175, 
-                     usecols = (0, 1, 3, 8, 9, 10, 12))
-    
-    # Remove reversals in the CTD data and get only the down-cast
-    data = ambient.extract_profile(raw, z_col=3, z_start=50.0)
-    
-    # Insert this data into an xarray.Dataset
-    ds = xr.Dataset()
-    ds.coords['z'] = (['z'], data[:,3])
-    ds['temperature'] = (('z'), data[:,0])
-    ds['pressure'] = (('z'), data[:,1])
-    ds['wetlab_fluorescence'] = (('z'), data[:,2])
-    ds['salinity'] = (('z'), data[:,4])
-    ds['density'] = (('z'), data[:,5])
-    ds['oxygen'] = (('z'), data[:,6])
-    ds.coords['time'] = date2num(datetime(2010, 5, 30, 18, 22, 12), 
-        units = 'seconds since 1970-01-01 00:00:00 0:00', 
-        calendar = 'julian')
-    ds.coords['lat'] = 28.0 + 43.945 / 60.0
-    ds.coords['lon'] = 360. - (88.0 + 22.607 / 60.0)
-    ds.attrs['summary'] = 'Dataset created by profile_from_ctd in the'\
-        ' ./bin directory of TAMOC'
-    ds.attrs['source'] = 'R/V Brooks McCall, station BM54'
-    ds.attrs['sea_name'] = 'Gulf of Mexico'
-    ds['temperature'].attrs = {'units' : 'deg C'}
-    ds['pressure'].attrs = {'units' : 'db'}
-    ds['wetlab_fluorescence'].attrs = {'units' : 'mg/m^3'}
-    ds['salinity'].attrs = {'units' : 'psu'}
-    ds['density'].attrs = {'units' : 'kg/m^3'}
-    ds['oxygen'].attrs = {'units' : 'mg/l'}
-    ds.coords['z'].attrs = {'units' : 'm'}
+    # Parsing the ASCII file is slow; keep a netCDF copy of the parsed 
+    # dataset and only rebuild it when the source file or this script, 
+    # which defines how the dataset is built and encoded, has changed
+    cache_dir = os.path.realpath(os.path.join(os.getcwd(),
+                                 os.path.dirname(__file__), 
+                                 '../../tamoc/test/output'))
+    cache_file = os.path.join(cache_dir,'BM54_ctd.nc')
+    use_cache = True
+    if not os.path.exists(cache_file) or \
+        os.path.getmtime(cache_file) < max(os.path.getmtime(dat_file), 
+        os.path.getmtime(__file__)):
+        
+        # Load in the data using numpy.loadtxt
+        raw = np.loadtxt(dat_file, comments = '#', skiprows = 175, 
+                         usecols = (0, 1, 3, 8, 9, 10, 12))
+        
+        # Remove reversals in the CTD data and get only the down-cast
+        data = ambient.extract_profile(raw, z_col=3, z_start=50.0)
+        
+        # Insert this data into an xarray.Dataset, using one transpose to 
+        # give each variable a contiguous array
+        cols = np.ascontiguousarray(data.transpose())
+        ds = xr.Dataset()
+        ds.coords['z'] = (['z'], cols[3])
+        ds['temperature'] = (('z'), cols[0])
+        ds['pressure'] = (('z'), cols[1])
+        ds['wetlab_fluorescence'] = (('z'), cols[2])
+        ds['salinity'] = (('z'), cols[4])
+        ds['density'] = (('z'), cols[5])
+        ds['oxygen'] = (('z'), cols[6])
+        ds.coords['time'] = np.datetime64('2010-05-30T18:22:12', 'ns')
+        ds.coords['time'].encoding = {
+            'units' : 'seconds since 1970-01-01 00:00:00'}
+        ds.coords['lat'] = 28.0 + 43.945 / 60.0
+        ds.coords['lon'] = 360. - (88.0 + 22.607 / 60.0)
+        ds.attrs['summary'] = 'Dataset created by profile_from_ctd in the'\
+            ' ./bin directory of TAMOC'
+        ds.attrs['source'] = 'R/V Brooks McCall, station BM54'
+        ds.attrs['sea_name'] = 'Gulf of Mexico'
+        ds['temperature'].attrs = {'units' : 'deg C'}
+        ds['pressure'].attrs = {'units' : 'db'}
+        ds['wetlab_fluorescence'].attrs = {'units' : 'mg/m^3'}
+        ds['salinity'].attrs = {'units' : 'psu'}
+        ds['density'].attrs = {'units' : 'kg/m^3'}
+        ds['oxygen'].attrs = {'units' : 'mg/l'}
+        ds.coords['z'].attrs = {'units' : 'm'}
+        
+        # Save the parsed data for the next run.  The CTD only resolves 
+        # a few significant digits, so store the data in single precision 
+        # and pack the oxygen and fluorescence data into 16-bit integers
+        encoding = {}
+        for name in ['temperature', 'pressure', 'salinity', 'density']:
+            encoding[name] = {'dtype' : 'float32'}
+        for name in ['wetlab_fluorescence', 'oxygen']:
+            v_min = ds[name].values.min()
+            v_max = ds[name].values.max()
+            encoding[name] = {'dtype' : 'int16', 
+                              'scale_factor' : (v_max - v_min) / 65534., 
+                              'add_offset' : (v_max + v_min) / 2., 
+                              '_FillValue' : -32768}
+        try:
+            ds.to_netcdf(cache_file, encoding=encoding)
+        except (IOError, OSError):
+            # The output directory is missing or read-only, so continue 
+            # with the parsed data
+            print('Could not write the CTD data cache to %s' % cache_file)
+            use_cache = False
+    
+    # Read the parsed CTD data from the cache so that every run uses the 
+    # same stored values
+    if use_cache:
+        with xr.open_dataset(cache_file) as cache:
+            ds = cache.load()
     
     # Create an ambient.Profile object for this dataset
     bm54 = ambient.Profile(ds, chem_names=['oxygen'])
     
     return bm54
 
+def nitrogen_solubility(air, m, T, S):
+    """
+    Compute the solubility of atmospheric nitrogen at the sea surface
+    
+    Evaluates the solubility of nitrogen in seawater in equilibrium with 
+    air at atmospheric pressure.
+    
+    Parameters
+    ----------
+    air : `dbm.FluidMixture`
+        Mixture object for air with nitrogen as the first component
+    m : ndarray
+        Masses of each component in the air mixture (kg)
+    T : float
+        Temperature (K)
+    S : float
+        Salinity (psu)
+    
+    Returns
+    -------
+    C_n2 : float
+        Concentration of dissolved nitrogen (kg/m^3)
+    
+    """
+    return air.solubility(m, T, 101325., S)[0,0]
+
 if __name__ == '__main__':
     """
     Demonstrate how to add data to an existing Profile object
@@ -119,20 +198,22 @@ if __name__ == '__main__':
     air = dbm.FluidMixture(['nitrogen', 'oxygen', 'argon', 'carbon_dioxide'])
     yk = np.array([0.78084, 0.20946, 0.009340, 0.00036])
     m = air.masses(yk)
+    n2_solubility = partial(nitrogen_solubility, air, m)
     
     # Compute the solubility of nitrogen at the air-water interface, then 
-    # correct for seawater compressibility
+    # correct for seawater compressibility.  Since we evaluate at the depths
+    # stored in the profile, read the data directly instead of interpolating
     z_coords = profile.interp_ds.coords['z'].values
-    n2_conc = np.zeros(len(z_coords))
-    for i in range(len(z_coords)):
-        T, S, P = profile.get_values(z_coords[i], ['temperature', 'salinity', 
-                  'pressure'])
-        Cs = air.solubility(m, T, 101325., S)[0,:] * \
-             seawater.density(T, S, P) / seawater.density(T, S, 101325.)
-        n2_conc[i] = Cs[0]
+    Ts = profile.interp_ds['temperature'].values
+    Ss = profile.interp_ds['salinity'].values
+    Ps = profile.interp_ds['pressure'].values
+    n2_conc = np.fromiter(map(n2_solubility, Ts, Ss), dtype=np.float64, 
+                          count=len(z_coords))
+    n2_conc *= seawater.density(Ts, Ss, Ps) / seawater.density(Ts, Ss, 
+                                                               101325.)
     
     # Add this computed nitrogen profile to the Profile dataset
-    data = np.vstack((z_coords, n2_conc)).transpose()
+    data = np.column_stack((z_coords, n2_conc))
     symbols = ['z', 'nitrogen']
     units = ['m', 'kg/m^3']
     comments = ['measured', 'computed from CTD data']
@@ -144,14 +225,12 @@ if __name__ == '__main__':
     # Plot the oxygen and nitrogren profiles to show that data have been 
     # added to the Profile object
     z = np.linspace(profile.z_min, profile.z_max, 250)
-    o2 = np.zeros(z.shape)
-    n2 = np.zeros(z.shape)
-    for i in range(len(z)):
-        n2[i], o2[i] = profile.get_values(z[i], ['nitrogen', 'oxygen'])
+    zd = profile.interp_ds.coords['z'].values
+    n2, o2 = interp1d(zd, np.vstack((profile.interp_ds['nitrogen'].values, 
+                      profile.interp_ds['oxygen'].values)))(z)
     
     plt.figure()
     plt.clf()
-    plt.show()
     
     ax1 = plt.subplot(121)
     ax1.plot(o2, z)
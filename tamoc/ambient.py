@@ -1734,9 +1734,7 @@ def xr_add_data_from_numpy(ds, z_coord, data, params, units):
         fill_value=(y[0,:], y[-1,:]))
     
     # Interpolate the new data onto the coordinates of the xarray Dataset
-    new_data = np.zeros((len(zs), len(params)))
-    for i in range(len(zs)):
-        new_data[i,:] = f(zs[i])
+    new_data = f(zs)
     
     # Insert these data into the xarray Dataset
     for param in params:
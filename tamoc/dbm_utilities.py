@@ -14,19 +14,55 @@ from __future__ import (absolute_import, division, print_function)
 
 from tamoc import seawater, dbm
 
+import os
+import re
+from copy import deepcopy
+from functools import wraps
+from multiprocessing import Pool
+
 import numpy as np
-from scipy.optimize import fsolve, fmin
+from scipy.optimize import fsolve, fmin, newton
 
 # Compatibility issues for Python 2
-try:
-    FileNotFoundError
-except NameError:
-    FileNotFoundError = IOError
+unicode = type(u' ')
 
 try:
-    ModuleNotFoundError
-except NameError:
-    ModuleNotFoundError = ImportError
+    from importlib.util import find_spec
+except ImportError:
+    find_spec = None
+
+# Declare some unit conversions
+M3_PER_FT3 = 0.0283168    # Volume of one cubic foot (m^3)
+M3_PER_BBL = 0.158987     # Volume of one barrel (m^3)
+FT3_PER_M3 = 1. / M3_PER_FT3
+BBL_PER_M3 = 1. / M3_PER_BBL
+
+# Define the composition of the natural gas used by natural_gas(); these 
+# arrays are read-only so that they can be shared between calls
+_NG_COMPOUNDS = ('methane', 'ethane', 'propane', 'isobutane', 'n-butane')
+_NG_FRACTIONS = np.array([0.939, 0.042, 0.0184, 0.0003, 0.0003])
+_NG_FRACTIONS.flags.writeable = False
+
+# Privat and Jaubert group contribution method coefficients for the 
+# natural gas compounds
+_NG_DELTA_GROUPS = np.array([
+    [0., 0., 0., 0., 1., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+    [0., 0., 0., 0., 0., 1., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+    [2., 1., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+    [3., 0., 1., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.],
+    [2., 2., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0., 0.]
+])
+_NG_DELTA_GROUPS.flags.writeable = False
+
+# Columns of the Privat and Jaubert group contribution method for the 
+# dissolved atmospheric gases.  Oxygen is not among the groups of this 
+# method; as in pedersen(), we assume it behaves like nitrogen.  Argon has 
+# no group, so it cannot be tracked with the group contribution method.
+_CA_GROUP_COLUMNS = {'carbon_dioxide' : 11, 'nitrogen' : 12, 'oxygen' : 12}
+
+# Coefficient of the Tyn and Calus formula used by compute_Vb() with the 
+# conversions between m^3/mol and cm^3/mol folded in
+_TYN_CALUS_COEF = 0.285 * (1.e6)**1.048 * 1.e-6
 
 
 def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
@@ -60,6 +96,9 @@ def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
     ca : list, default=[]
         List of dissolved atmospheric gases to track as part of the oil;
         choices are 'nitrogen', 'oxygen', 'argon', and 'carbon_dioxide'.
+        If the oil computes its binary interaction coefficients by the 
+        group contribution method (i.e., it has `delta_groups`), argon is
+        not supported and oxygen is assigned the group of nitrogen.
     fp_type : int
         Gives the fluid type (0: gas, 1: oil) for which the flow rate is
         specified through the variable q_oil.
@@ -68,13 +107,19 @@ def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
     -------
     oil : dbm.FluidMixture
         A discrete bubble model FluidMixture object that contains the 
-        property data for the desired live oil.
+        property data for the desired live oil.  If `substance` provides a
+        `dbm_mixture` and no gas is added (gor <= 0 and `ca` is empty), 
+        this is the provided `dbm_mixture` object itself, not a copy; 
+        changes to one also change the other.
     mass_flux : np.array
         An array of gas and liquid mass fluxes for each chemical component
         in the mixture (kg/s) required to achieve the desired flow rate of 
         dead oil at the surface, q_oil.
         
     """
+    # Only a user-provided dbm.FluidMixture can be reused as the final oil
+    oil = None
+    
     if isinstance(substance, dict):
         
         if 'composition' in substance:
@@ -101,12 +146,13 @@ def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
                 delta_groups = dbm_mixture.delta_groups
             units = dbm_mixture.chem_units
             mass_frac = substance['masses']
+            oil = dbm_mixture
         
         else:
             print('Error:  TAMOC substance dictionary does not have correct', 
                 'keys')
     
-    elif isinstance(substance, str) or isinstance(substance, unicode):
+    elif isinstance(substance, (str, unicode)):
         
         # We want to create an oil from a NOAA ADIOS library...but the
         # oil_library package is Python 2 only and no longer supported. 
@@ -115,47 +161,23 @@ def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
         # oil_library is installed and working, then we try to decide whether
         # the .json file that goes with the adios_db is available or not.
         # Finally, we decide which way to try to load this oil
-        try:
-            import oil_library
-            # The oil_library exists, but the user may still want to use 
-            # the adios_db.  Check whether it exists and the required inputs 
-            # are available
-            try:
-                import adios_db
-                # Lastly, we check for the .json file required by the 
-                # adios_db
-                try:
-                    # Try to open ``substance`` as a file
-                    f = open(substance)
-                    f.close()
-                    
-                    # Make sure this file is a .json file
-                    if 'json' in substance:
-                        # Use the adios_db with this .json file
-                        composition, mass_frac, user_data, delta, \
-                            delta_groups, units = load_adios_oil(substance)
-                    else:
-                        # This is a file name, but not a .json file, so we 
-                        # have to try the oil library
-                        composition, mass_frac, user_data, delta, \
-                            delta_groups, units = load_gnome_oil(substance)
-                            
-                except FileNotFoundError:
-                    # We have to use the oil_library
-                    composition, mass_frac, user_data, delta, delta_groups, \
-                        units = load_gnome_oil(substance)
-            
-            except ModuleNotFoundError:
-                # The user does not have the adios_db installed, so we have to 
-                # use the oil_library
-                composition, mass_frac, user_data, delta, delta_groups, \
-                    units = load_gnome_oil(substance)
-        
-        except ModuleNotFoundError:
+        if not _has_module('oil_library', check_import=True):
             # The user does not have the oil_library; hence, the 
             # adios_db package is the only way this will work
-            composition, mass_frac, user_data, delta, delta_groups, units = \
-                load_adios_oil(substance)
+            load_oil = load_adios_oil
+        
+        elif _has_module('adios_db') and os.path.isfile(substance) and \
+            'json' in substance:
+            # The user wants to use the adios_db with this .json file
+            load_oil = load_adios_oil
+        
+        else:
+            # Either the adios_db is not installed or the substance is not 
+            # a .json file, so we have to use the oil_library
+            load_oil = load_gnome_oil
+        
+        composition, mass_frac, user_data, delta, delta_groups, units = \
+            load_oil(substance)
     
     # Add the atmospherica gases to the FluidMixture, if desired
     if len(ca) > 0:
@@ -168,38 +190,90 @@ def get_oil(substance, q_oil, gor, ca=[], fp_type=1):
         new_mf[0:len(mass_frac)] = mass_frac
         mass_frac = new_mf
         
-        # Update the binary interaction coefficients
-        if delta_groups == None:
-            oil = dbm.FluidMixture(composition, user_data=user_data)
-            delta = pedersen(oil.M, composition)
+        # Update the binary interaction coefficients.  If we mix in gas 
+        # below, mix_gas_for_gor() updates delta for the whole composition.
+        if delta_groups is None:
+            if gor <= 0.:
+                oil = dbm.FluidMixture(composition, user_data=user_data)
+                delta = pedersen(oil.M, composition)
         else:
-            air_groups = np.zeros((len(ca),15))
+            # Each gas needs a group so that its row of delta_groups is 
+            # not all zero
+            for gas in ca:
+                if gas not in _CA_GROUP_COLUMNS:
+                    raise ValueError('Dissolved gas %s has no group in the '
+                        'group contribution method; choose from %s' % 
+                        (gas, sorted(_CA_GROUP_COLUMNS)))
+            n_oil = delta_groups.shape[0]
+            new_groups = np.zeros((n_oil + len(ca), 15))
+            new_groups[:n_oil,:] = delta_groups
             for i in range(len(ca)):
-                if ca[i] == 'nitrogen':
-                    air_groups[i,12] = 1.
-                if ca[i] == 'carbon_dioxide':
-                    air_groups[i,11] = 1.
-            delta_groups = np.vstack((delta_group, air_groups))
-    
+                new_groups[n_oil + i,_CA_GROUP_COLUMNS[ca[i]]] = 1.
+            delta_groups = new_groups
     
     # Create a live oil mixture for this oil that has the given GOR
     if gor > 0.:
-        composition, mass_frac, delta, delta_grous = \
+        composition, mass_frac, delta, delta_groups = \
             mix_gas_for_gor(composition, mass_frac, user_data, delta, 
             delta_groups, gor)
     
+    # Create the dbm.FluidMixture object unless the user provided one that 
+    # already describes this dead oil
+    if oil is None or len(ca) > 0 or gor > 0.:
+        oil = dbm.FluidMixture(composition, delta=delta, 
+            delta_groups=delta_groups, user_data=user_data)
+    
     # Get the mass flux for the desired oil flow rate
     mass_flux = set_mass_fluxes(composition, mass_frac, user_data, delta, 
-        delta_groups, q_oil, fp_type)
-    
-    # Create the dbm.FluidMixture object
-    oil = dbm.FluidMixture(composition, delta=delta, 
-        delta_groups=delta_groups, user_data=user_data)
+        delta_groups, q_oil, fp_type, oil)
     
     # Return the results
     return (oil, mass_flux)
 
 
+# Whether optional packages are available, recorded on first use so that 
+# the search is not repeated on every call
+_importable = {}
+
+def _has_module(name, check_import=False):
+    """
+    Check whether an optional package is available
+    
+    By default, the package is only located, not imported, so that heavy 
+    packages like adios_db are not loaded until an oil is actually read 
+    with them.  Packages that may be installed but broken (e.g., the 
+    Python 2 only oil_library) should be checked with `check_import` set 
+    to True.
+    
+    Parameters
+    ----------
+    name : str
+        Name of the package to find
+    check_import : bool, default=False
+        If True, the package is imported to check that it works, and any
+        ImportError (including one raised by a missing dependency of the 
+        package) marks it as unavailable.
+    
+    Returns
+    -------
+    has_module : bool
+        True if the package is available; otherwise, False.
+    
+    """
+    key = (name, check_import)
+    if key not in _importable:
+        if find_spec is not None and not check_import:
+            _importable[key] = find_spec(name) is not None
+        else:
+            try:
+                __import__(name)
+                _importable[key] = True
+            except ImportError:
+                _importable[key] = False
+    
+    return _importable[key]
+
+
 # --- Discrete Bubble Model Utilities ---
 
 def load_tamoc_oil(substance):
@@ -251,10 +325,7 @@ def load_tamoc_oil(substance):
         user_data = {}
     
     # Convert the masses to mass fraction 
-    if isinstance(masses, float):
-        masses = np.array([masses])
-    elif isinstance(masses, list):
-        masses = np.array(masses)
+    masses = np.atleast_1d(np.asarray(masses, dtype=np.float64))
     mass_frac = masses / np.sum(masses)
     
     # Create a dbm.FluidMixture object for this composition
@@ -324,49 +395,40 @@ def format_dbm_data(composition, M, Pc, Tc, omega, kh_0, neg_dH_solR, nu_bar,
         A dictionary of units for each chemical component in the mixture in
         the format expected by the tamoc.dbm module objects.
     
+    Raises
+    ------
+    ValueError : 
+        If any of the property arrays does not have one value for each 
+        chemical component in `composition`.
+    
     """
     # Count the number of components in the oil mixture
     nc = len(composition)
     
     # Set flags to -9999. as expected by the tamoc.dbm module for any 
     # parameters that were not passed to this function 
-    if not isinstance(Vc, np.ndarray):
-        Vc = np.zeros(nc) - 9999.
-    if not isinstance(Tb, np.ndarray):
-        Tb = np.zeros(nc) - 9999.
-    if not isinstance(Vb, np.ndarray):
-        Vb = np.zeros(nc) - 9999.
-    if not isinstance(B, np.ndarray):
-        B = np.zeros(nc) - 9999.
-    if not isinstance(dE, np.ndarray):
-        dE = np.zeros(nc) - 9999.
+    Vc = np.full(nc, -9999.) if Vc is None else np.asarray(Vc)
+    Tb = np.full(nc, -9999.) if Tb is None else np.asarray(Tb)
+    Vb = np.full(nc, -9999.) if Vb is None else np.asarray(Vb)
+    B = np.full(nc, -9999.) if B is None else np.asarray(B)
+    dE = np.full(nc, -9999.) if dE is None else np.asarray(dE)
     
     # Disable aqueous dissolution of insoluble components
-    for i in range(nc):
-        if kh_0[i] < 0.:
-            kh_0[i] = 0.
-    
-    # Create an emmpty dictionary of chemical property data
-    data = {}
-    
-    # Fill the dictionary with the properties for each chemical component
-    for i in range(nc):
-        # Add this chemical
-        data[composition[i]] = {
-            'M' : M[i],
-            'Pc' : Pc[i],
-            'Tc' : Tc[i],
-            'omega' : omega[i],
-            'kh_0' : kh_0[i],
-            '-dH_solR' : neg_dH_solR[i],
-            'nu_bar' : nu_bar[i],
-            'K_salt' : K_salt[i],
-            'Vc' : Vc[i],
-            'Tb' : Tb[i],
-            'Vb' : Vb[i], 
-            'B' : B[i], 
-            'dE' : dE[i]
-        }
+    np.maximum(kh_0, 0., out=kh_0)
+    
+    # Check that each property has a value for each chemical component
+    keys = ('M', 'Pc', 'Tc', 'omega', 'kh_0', '-dH_solR', 'nu_bar', 'K_salt', 
+        'Vc', 'Tb', 'Vb', 'B', 'dE')
+    props = (M, Pc, Tc, omega, kh_0, neg_dH_solR, nu_bar, K_salt, Vc, Tb, Vb, 
+        B, dE)
+    for key, values in zip(keys, props):
+        if len(values) != nc:
+            raise ValueError('%s has %d values, but the composition has %d '
+                'components' % (key, len(values), nc))
+    
+    # Fill a dictionary with the properties for each chemical component
+    data = {name : dict(zip(keys, values)) 
+            for name, values in zip(composition, zip(*props))}
     
     # This function requires user to provide data in SI units suitable 
     # for TAMOC.  Assume this has been done.
@@ -459,7 +521,7 @@ def mix_gas_for_gor(dead_composition, dead_mass_frac, user_data, delta,
     mf_oil[len(gas_mf):] = dead_mass_frac
     
     # Update the binary interaction coefficients
-    if delta_groups == None:
+    if delta_groups is None:
         oil = dbm.FluidMixture(composition, user_data=user_data)
         delta = pedersen(oil.M, composition)
     else:
@@ -477,15 +539,34 @@ def mix_gas_for_gor(dead_composition, dead_mass_frac, user_data, delta,
     p_oil = oil.density(mf_oil, T, P)[1,0]
     
     # Get an estimate for the gas fraction from the GOR
-    v_gas = gor * 0.0283168  # converts ft^3 = m^3
-    v_oil = 0.158987         # converts bbl to m^3
+    v_gas = gor * M3_PER_FT3  # converts ft^3 = m^3
+    v_oil = M3_PER_BBL        # converts bbl to m^3
     m_gas = p_gas * v_gas
     m_oil = p_oil * v_oil
     beta = m_gas / (m_gas + m_oil)
     
+    # Remember the residuals already computed so that repeated evaluations
+    # at the same gas fraction do not repeat the equilibrium calculation
+    residuals = {}
+    def cached_gas_fraction(beta, *args):
+        beta = np.ravel(beta)[0]
+        if beta not in residuals:
+            residuals[beta] = gas_fraction(beta, *args)
+        return residuals[beta]
+    
     # Iterate to converge on a correct gas fraction to have the desired
-    # gas to oil ratio
-    beta = fsolve(gas_fraction, beta, args=(gor, oil, mf_gas, mf_oil, T, P))
+    # gas to oil ratio.  The secant method needs fewer equilibrium 
+    # calculations than fsolve(), which spends extra evaluations on a 
+    # finite-difference Jacobian; fall back to fsolve() if it fails.
+    args = (gor, oil, mf_gas, mf_oil, T, P)
+    try:
+        beta = newton(cached_gas_fraction, beta, args=args, 
+            tol=1.e-10 * beta)
+    except RuntimeError:
+        beta = np.nan
+    if not 0. < beta < 1.:
+        beta = fsolve(cached_gas_fraction, m_gas / (m_gas + m_oil), 
+            args=args)[0]
     
     # Use the final value of beta to get the composition of oil and gas
     mass_frac = beta * mf_gas + (1. - beta) * mf_oil
@@ -513,20 +594,10 @@ def natural_gas():
         the binary interaction coefficients
     
     """
-    # Define the gas composition
-    gas_compounds = ['methane', 'ethane', 'propane', 'isobutane', 'n-butane']
-    gas_fractions = np.array([0.939, 0.042, 0.0184, 0.0003, 0.0003])
-    
-    # Insert the Privat and Jaubert group contribution method coefficients
-    # for estimating binary interaction coefficients
-    gas_delta_groups = np.zeros((5,15))
-    gas_delta_groups[0,4] = 1.
-    gas_delta_groups[1,5] = 1.
-    gas_delta_groups[2,:2] = np.array([2., 1.])
-    gas_delta_groups[3,:3] = np.array([3., 0., 1.])
-    gas_delta_groups[4,:2] = np.array([2., 2.])
-    
-    return (gas_compounds, gas_fractions, gas_delta_groups)
+    # Return copies of the module-level definitions so that callers may 
+    # modify the results
+    return (list(_NG_COMPOUNDS), _NG_FRACTIONS.copy(), 
+        _NG_DELTA_GROUPS.copy())
 
 
 def gas_fraction(beta, gor_0, oil, mf_gas, mf_oil, T, P):
@@ -581,8 +652,8 @@ def gas_fraction(beta, gor_0, oil, mf_gas, mf_oil, T, P):
     v_oil = np.sum(mf_oil) / p_oil  # m^3
     
     # Report the gas to oil ratio in standard units
-    v_gas = v_gas / 0.0283168   # m^3 to ft^3
-    v_oil = v_oil / 0.158987    # m^3 to barrels
+    v_gas = v_gas * FT3_PER_M3   # m^3 to ft^3
+    v_oil = v_oil * BBL_PER_M3   # m^3 to barrels
     gor = v_gas / v_oil
     
     # Return the deviation from the desired gor
@@ -590,7 +661,7 @@ def gas_fraction(beta, gor_0, oil, mf_gas, mf_oil, T, P):
 
 
 def set_mass_fluxes(composition, mass_frac, user_data, delta, delta_groups, 
-    q_oil, fp_type):
+    q_oil, fp_type, oil=None):
     """
     Compute the mass fluxes to achieve a desired oil flow rate
     
@@ -615,6 +686,10 @@ def set_mass_fluxes(composition, mass_frac, user_data, delta, delta_groups,
     fp_type : int
         Gives the fluid type (0: gas, 1: oil) for which the flow rate is
         specified through the variable q_oil.
+    oil : dbm.FluidMixture, default=None
+        A dbm.FluidMixture object already created for this composition, 
+        user_data, delta, and delta_groups.  If not provided, it is created 
+        here.
     
     Returns
     -------
@@ -626,8 +701,9 @@ def set_mass_fluxes(composition, mass_frac, user_data, delta, delta_groups,
     
     """
     # Create a dbm.FluidMixture object
-    oil = dbm.FluidMixture(composition, delta=delta, 
-        delta_groups=delta_groups, user_data=user_data)
+    if oil is None:
+        oil = dbm.FluidMixture(composition, delta=delta, 
+            delta_groups=delta_groups, user_data=user_data)
     
     # Get the equilibrium at standard conditions
     P0 = 101325.
@@ -638,7 +714,7 @@ def set_mass_fluxes(composition, mass_frac, user_data, delta, delta_groups,
     # total petroleum fluid flow rate of 1 kg/s (e.g., using mass_flux equal
     # to mass_frac)
     p_oil = oil.density(m0[fp_type,:], T0, P0)[fp_type,0]
-    v_oil = np.sum(m0[fp_type,:]) / p_oil / 0.158987 # bbl
+    v_oil = np.sum(m0[fp_type,:]) / p_oil * BBL_PER_M3 # bbl
     
     # Adjust the masses to yield the desired flow rate of oil in bbl/d
     k_fac = (q_oil / 86400.) / v_oil
@@ -649,6 +725,74 @@ def set_mass_fluxes(composition, mass_frac, user_data, delta, delta_groups,
 
 # --- OilLibrary Utilities ---
 
+# Results of the oils already loaded from the NOAA Oil Library.  Loading an 
+# oil includes the Vc tuning optimization, which is expensive; hence, we only 
+# do this once for each oil during a session.
+_noaa_oils = {}
+
+def _cache_noaa_oil(load_oil):
+    """
+    Remember the results of a function that loads a NOAA Oil Library oil
+    
+    Wraps ``load_gnome_oil`` or ``load_adios_oil`` so that each oil is only
+    loaded once per session.  The results are stored by the loading function
+    name and ADIOS ID, together with the modification time when the ADIOS ID
+    is a file.  A deep copy of the stored results is returned so that the 
+    calling program may modify them freely.
+    
+    Parameters
+    ----------
+    load_oil : function
+        Function that takes the ADIOS ID as its only argument and returns 
+        the TAMOC chemical property data for this oil.
+    
+    Returns
+    -------
+    cached_load_oil : function
+        Function with the same signature as ``load_oil`` that uses the 
+        stored results when available.
+    
+    """
+    @wraps(load_oil)
+    def cached_load_oil(adios_id):
+        # Build a key that is unique to this oil
+        key = _noaa_oil_key(load_oil.__name__, adios_id)
+        
+        # Load this oil only if we have not already done so
+        if key not in _noaa_oils:
+            _noaa_oils[key] = load_oil(adios_id)
+        
+        return deepcopy(_noaa_oils[key])
+    
+    return cached_load_oil
+
+
+def _noaa_oil_key(loader_name, adios_id):
+    """
+    Build the key for an oil in the stored NOAA Oil Library results
+    
+    Parameters
+    ----------
+    loader_name : str
+        Name of the function that loads the oil (e.g., 'load_adios_oil').
+    adios_id : str
+        ADIOS ID or .json file name of the oil.
+    
+    Returns
+    -------
+    key : tuple
+        Key for this oil in the `_noaa_oils` dictionary.  When the ADIOS ID
+        is a file, the key includes its modification time.
+    
+    """
+    key = (loader_name, adios_id)
+    if os.path.isfile(adios_id):
+        key += (os.path.getmtime(adios_id),)
+    
+    return key
+
+
+@_cache_noaa_oil
 def load_gnome_oil(adios_id):
     """
     Load an oil from the NOAA OilLibrary (formerly, ADIOS)
@@ -706,16 +850,15 @@ def load_gnome_oil(adios_id):
     
     # Convert these densities so that the new densities will give the same 
     # oil density using the formula density = 1. / sum(mass_frac / density)
-    density2 = density * (np.sum(density * mass_frac)) / (1. / 
-        np.sum(mass_frac / density))
+    density2 = density * (np.dot(density, mass_frac) * 
+        np.dot(mass_frac, 1. / density))
     
     # Read in the names of each of the oil pseudocomponents
     composition = list(gnome_oil.component_types)
     
     # TAMOC requires unique names for each pseudocomponent; we add a counter
     # to each SARA analysis type (e.g., Saturates1, Saturates2, etc.)
-    sequence_names(composition, 'Saturates')
-    sequence_names(composition, 'Aromatics')
+    sequence_names(composition, ('Saturates', 'Aromatics'))
     
     # Report any error messages or warnings
     if np.any(boiling_point < 231):
@@ -733,21 +876,18 @@ def load_gnome_oil(adios_id):
     (Tc, Pc, Vc, M, omega, delta) = get_preos_params(boiling_point, 
         molecular_weight, density)
     
-    nu_bar = (-2.203e-5 * Pc + 518.6 * M + 143.4) * 1.e-6
-    neg_delta_H_sol_R = 2.637 * Tc + 22.48e6 * nu_bar + 314.6
-    K_salt = (-1.345 * M + 2799.4 * nu_bar +  0.083556) / 1000.
+    nu_bar, neg_delta_H_sol_R, K_salt = get_dissolution_params(Tc, Pc, M)
               
     # Estimate Vb based on the Tyn and Calus formula (see dbm.py)
     Vb = compute_Vb(Vc)
     
-    # Turn off solubility of non-aromatic hydrocarbons
-    for i in range(len(composition)):
-        if composition[i].find('Aromatics') < 0:
-            # Use -9999. flag expected in dbm module of TAMOC
-            neg_delta_H_sol_R[i] = -9999.
-            k_h_0[i] = -9999.
-            nu_bar[i] = -9999.
-            K_salt[i] = -9999.
+    # Turn off solubility of non-aromatic hydrocarbons using the -9999. flag
+    # expected in dbm module of TAMOC
+    insoluble = np.char.find(np.array(composition), 'Aromatics') < 0
+    neg_delta_H_sol_R[insoluble] = -9999.
+    k_h_0[insoluble] = -9999.
+    nu_bar[insoluble] = -9999.
+    K_salt[insoluble] = -9999.
     
     # Format these data as they are normally used in the dbm module of TAMOC
     user_data, units = format_dbm_data(composition, M, Pc, Tc, omega, k_h_0, 
@@ -764,25 +904,12 @@ def load_gnome_oil(adios_id):
         rho_0[i] = rho_data[i].kg_m_3
         w_0[i] = rho_data[i].weathering
     
-    # Perform tuning of Vc to get better densities
-    user_data = Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, density2,
-        delta, user_data)
-    
-    # Update the value of Vb in the user_data database using the final 
-    # value of Vc after tuning.
-    for i in range(len(composition)):
-        Vc = user_data[composition[i]]['Vc']
-        Vb = compute_Vb(Vc)
-        user_data[composition[i]]['Vb'] = Vb
-    
-    # We do not use the group contribution methods for the binary interaction
-    # coefficients
-    delta_groups = None
-    
-    # Return the results
-    return (composition, mass_frac, user_data, delta, delta_groups, units)
+    # Tune Vc to get better densities and return the results
+    return finalize_oil(mass_frac, composition, T_0, rho_0, w_0, density2, 
+        delta, user_data, units)
 
 
+@_cache_noaa_oil
 def load_adios_oil(adios_id):
     """
     Load an oil from the NOAA OilLibrary (formerly, ADIOS)
@@ -836,24 +963,23 @@ def load_adios_oil(adios_id):
     molecular_weight = np.array(gnome_oil['molecular_weight'])  # g/mol
     mass_frac = np.array(gnome_oil['mass_fraction'])            # --
     boiling_point = np.array(gnome_oil['boiling_point'])        # K
-    vapor_pressure_5C = gnome_vapor_pressure(gnome_oil, 278.15) # Pa
-    vapor_pressure_25C = gnome_vapor_pressure(gnome_oil, 298.15) # Pa
+    vapor_pressure_5C, vapor_pressure_25C = gnome_vapor_pressure(gnome_oil, 
+        np.array([278.15, 298.15])) # Pa
     
     # Extract the densities of each pseudocomponent
     density = np.array(gnome_oil['component_density'])
     
     # Convert these densities so that the new densities will give the same 
     # oil density using the formula density = 1. / sum(mass_frac / density)
-    density2 = density * (np.sum(density * mass_frac)) / (1. / 
-        np.sum(mass_frac / density))
+    density2 = density * (np.dot(density, mass_frac) * 
+        np.dot(mass_frac, 1. / density))
     
     # Read in the names of each of the oil pseudocomponents
     composition = list(gnome_oil['sara_type'])
     
     # TAMOC requires unique names for each pseudocomponent; we add a counter
     # to each SARA analysis type (e.g., Saturates1, Saturates2, etc.)
-    sequence_names(composition, 'Saturates')
-    sequence_names(composition, 'Aromatics')
+    sequence_names(composition, ('Saturates', 'Aromatics'))
     
     # Report any error messages or warnings
     if np.any(boiling_point < 231):
@@ -871,21 +997,18 @@ def load_adios_oil(adios_id):
     (Tc, Pc, Vc, M, omega, delta) = get_preos_params(boiling_point, 
         molecular_weight, density)
     
-    nu_bar = (-2.203e-5 * Pc + 518.6 * M + 143.4) * 1.e-6
-    neg_delta_H_sol_R = 2.637 * Tc + 22.48e6 * nu_bar + 314.6
-    K_salt = (-1.345 * M + 2799.4 * nu_bar +  0.083556) / 1000.
+    nu_bar, neg_delta_H_sol_R, K_salt = get_dissolution_params(Tc, Pc, M)
               
     # Estimate Vb based on the Tyn and Calus formula (see dbm.py)
     Vb = compute_Vb(Vc)
     
-    # Turn off solubility of non-aromatic hydrocarbons
-    for i in range(len(composition)):
-        if composition[i].find('Aromatics') < 0:
-            # Use -9999. flag expected in dbm module of TAMOC
-            neg_delta_H_sol_R[i] = -9999.
-            k_h_0[i] = -9999.
-            nu_bar[i] = -9999.
-            K_salt[i] = -9999.
+    # Turn off solubility of non-aromatic hydrocarbons using the -9999. flag
+    # expected in dbm module of TAMOC
+    insoluble = np.char.find(np.array(composition), 'Aromatics') < 0
+    neg_delta_H_sol_R[insoluble] = -9999.
+    k_h_0[insoluble] = -9999.
+    nu_bar[insoluble] = -9999.
+    K_salt[insoluble] = -9999.
     
     # Format these data as they are normally used in the dbm module of TAMOC
     user_data, units = format_dbm_data(composition, M, Pc, Tc, omega, k_h_0, 
@@ -893,34 +1016,68 @@ def load_adios_oil(adios_id):
         B=None, dE=None)
         
     # Extract the measurements of the whole oil density
-    rho_data = gnome_oil['densities']
-    rho_ref_temps = gnome_oil['density_ref_temps']
-    rho_weathering = gnome_oil['density_weathering']
-    T_0 = np.zeros(len(rho_data))
-    rho_0 = np.zeros(len(rho_data))
-    w_0 = np.zeros(len(rho_data))
-    for i in range(len(rho_data)):
-        T_0[i] = rho_ref_temps[i]
-        rho_0[i] = rho_data[i]
-        w_0[i] = rho_weathering[i]
+    T_0 = np.asarray(gnome_oil['density_ref_temps'], dtype=np.float64)
+    rho_0 = np.asarray(gnome_oil['densities'], dtype=np.float64)
+    w_0 = np.asarray(gnome_oil['density_weathering'], dtype=np.float64)
     
-    # Perform tuning of Vc to get better densities
-    user_data = Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, density2,
-        delta, user_data)
+    # Tune Vc to get better densities and return the results
+    return finalize_oil(mass_frac, composition, T_0, rho_0, w_0, density2, 
+        delta, user_data, units)
+
+
+def load_adios_oils(adios_ids, processes=None):
+    """
+    Load several oils from the NOAA ADIOS database in parallel
+    
+    Each oil is loaded with ``load_adios_oil`` in a separate worker process.
+    Since the property estimation and Vc tuning for each oil are 
+    independent, this speeds up loading a large set of oils on a 
+    multi-core computer.  Oils already loaded during this session are 
+    taken from the stored results, and the new results are stored in the
+    calling process so that later calls to ``load_adios_oil`` or 
+    ``get_oil`` for the same oils do not load them again.  On platforms 
+    that start new processes by spawning (e.g., Windows and macOS), call 
+    this function from within an ``if __name__ == '__main__':`` block of 
+    the main program.
     
-    # Update the value of Vb in the user_data database using the final 
-    # value of Vc after tuning.
-    for i in range(len(composition)):
-        Vc = user_data[composition[i]]['Vc']
-        Vb = compute_Vb(Vc)
-        user_data[composition[i]]['Vb'] = Vb
+    Parameters
+    ----------
+    adios_ids : list
+        List of ADIOS IDs or .json file names of the oils to load, as 
+        accepted by ``load_adios_oil``.
+    processes : int, default=None
+        Number of worker processes to use.  If `None`, the number of CPUs 
+        on this computer is used.
     
-    # We do not use the group contribution methods for the binary interaction
-    # coefficients
-    delta_groups = None
+    Returns
+    -------
+    oils : list
+        List of the tuples returned by ``load_adios_oil`` for each oil, in 
+        the same order as `adios_ids`.
     
-    # Return the results
-    return (composition, mass_frac, user_data, delta, delta_groups, units)
+    """
+    # Find the oils that have not been loaded yet
+    keys = [_noaa_oil_key('load_adios_oil', adios_id) for adios_id in 
+        adios_ids]
+    new_ids = []
+    new_keys = []
+    for adios_id, key in zip(adios_ids, keys):
+        if key not in _noaa_oils and key not in new_keys:
+            new_ids.append(adios_id)
+            new_keys.append(key)
+    
+    # Load these oils in parallel and store the results in this process
+    if len(new_ids) > 0:
+        pool = Pool(processes)
+        try:
+            new_oils = pool.map(load_adios_oil, new_ids)
+        finally:
+            pool.close()
+            pool.join()
+        for key, oil in zip(new_keys, new_oils):
+            _noaa_oils[key] = oil
+    
+    return [deepcopy(_noaa_oils[key]) for key in keys]
 
 
 def load_simap_oil(simap):
@@ -1037,23 +1194,19 @@ def load_simap_oil(simap):
     solubility = solubility / molecular_weight / 1000.
     
     # Use the ADIOS equations to estimate the density of each psuedo-component
-    density = np.zeros(boiling_point.shape)
-    for i in range(len(composition)):
-        if 'AR' in composition[i]:
-            K_w = 10.
-        elif 'AL' in composition[i]:
-            K_w = 12.
-        else:
-            K_w = 0.
-        
-        if K_w == 0:
-            density[i] = 1100.
-        else:
-            density[i] = 1000. * (1.8 * boiling_point[i]) ** (1. / 3.) / K_w
+    # using the Watson characterization factor K_w = 10 for aromatics and 
+    # K_w = 12 for aliphatics; all other compounds have a density of 1100
+    names = np.array(composition)
+    aromatic = np.char.find(names, 'AR') >= 0
+    hydrocarbon = aromatic | (np.char.find(names, 'AL') >= 0)
+    K_w = np.where(aromatic, 10., 12.)
+    density = np.full(boiling_point.shape, 1100.)
+    density[hydrocarbon] = 1000. * (1.8 * boiling_point[hydrocarbon]) ** \
+        (1. / 3.) / K_w[hydrocarbon]
     
     # Convert these densities to the definitions used by Gros et al.
-    density2 = density * (np.sum(density * mass_frac)) / (1. / 
-        np.sum(mass_frac / density))
+    density2 = density * (np.dot(density, mass_frac) * 
+        np.dot(mass_frac, 1. / density))
     
     # Report any error messages or warnings
     if np.any(boiling_point < 231):
@@ -1068,45 +1221,28 @@ def load_simap_oil(simap):
     k_h_0 = get_henry_constant(solubility, vapor_pressure, molecular_weight)
     Tc, Pc, Vc, M, omega, delta = get_preos_params(boiling_point, 
         molecular_weight, density)
-    nu_bar = (-2.203e-5 * Pc + 518.6 * M + 143.4) * 1.e-6
-    neg_delta_H_sol_R = 2.637 * Tc + 22.48e6 * nu_bar + 314.6
-    K_salt = (-1.345 * M + 2799.4 * nu_bar +  0.083556) / 1000.
+    nu_bar, neg_delta_H_sol_R, K_salt = get_dissolution_params(Tc, Pc, M)
     
     # Estimate Vb based on the Tyn an Calus formula (see dbm.py)
     Vb = compute_Vb(Vc)
     
-    # Turn off solubility of non-aromatic hydrocarbons
-    for i in range(len(composition)):
-        if 'AR' not in composition[i]:
-            # Use -9999. flag expected in dbm module of TAMOC
-            neg_delta_H_sol_R[i] = -9999.
-            k_h_0[i] = -9999.
-            nu_bar[i] = -9999.
-            K_salt[i] = -9999.
+    # Turn off solubility of non-aromatic hydrocarbons using the -9999. flag
+    # expected in dbm module of TAMOC
+    insoluble = np.char.find(np.array(composition), 'AR') < 0
+    neg_delta_H_sol_R[insoluble] = -9999.
+    k_h_0[insoluble] = -9999.
+    nu_bar[insoluble] = -9999.
+    K_salt[insoluble] = -9999.
     
     # Format these data as they are normally used in the dbm module of TAMOC
     user_data, units = format_dbm_data(composition, M, Pc, Tc, omega, k_h_0, 
         neg_delta_H_sol_R, nu_bar, K_salt, Vc, boiling_point, Vb, 
         B=None, dE=None)
     
-    # Perform tuning of Vc to get better densities
+    # Tune Vc to get better densities and return the results
     w_0 = np.zeros(len(T_0))
-    user_data = Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, density2,
-        delta, user_data)
-    
-    # Update the value of Vb in the user_data database using the final 
-    # value of Vc after tuning.
-    for i in range(len(composition)):
-        Vc = user_data[composition[i]]['Vc']
-        Vb = compute_Vb(Vc)
-        user_data[composition[i]]['Vb'] = Vb
-    
-    # We do not use the group contribution methods for the binary interaction
-    # coefficients
-    delta_groups = None
-    
-    # Return the results
-    return (composition, mass_frac, user_data, delta, delta_groups, units)
+    return finalize_oil(mass_frac, composition, T_0, rho_0, w_0, density2, 
+        delta, user_data, units)
 
 
 def sequence_names(sara_names, name):
@@ -1118,8 +1254,10 @@ def sequence_names(sara_names, name):
     sara_names : list
         List of strings containing the names of each pseudo-component in an 
         oil based on SARA analysis.  
-    name : str
-        Name of the pseudo-component to edit ('Saturates' or 'Aromatics')
+    name : str or tuple
+        Name of the pseudo-component to edit ('Saturates' or 'Aromatics'),
+        or a tuple of names to number in a single pass through the list,
+        with a separate counter for each name.
     
     Notes
     -----
@@ -1129,11 +1267,14 @@ def sequence_names(sara_names, name):
     that variable in the calling function or program.
     
     """
-    id_num = 1
-    for i in range(len(sara_names)):
-        if sara_names[i] == name:
-            sara_names[i] = sara_names[i] + str(id_num)
-            id_num += 1
+    if isinstance(name, (str, unicode)):
+        name = (name,)
+    
+    id_num = dict.fromkeys(name, 1)
+    for i, sara_name in enumerate(sara_names):
+        if sara_name in id_num:
+            sara_names[i] = sara_name + str(id_num[sara_name])
+            id_num[sara_name] += 1
 
 
 def gnome_vapor_pressure(gnome_oil, Ta):
@@ -1148,8 +1289,9 @@ def gnome_vapor_pressure(gnome_oil, Ta):
     ----------
     gnome_oil : dict
         Dictionary of parameters required to create a GNOME Oil object.
-    Ta : float
-        Temperature (K)
+    Ta : float or ndarray
+        Temperature (K).  If an array of temperatures is given, the vapor 
+        pressures at each temperature are returned in the rows of the result.
     
     Returns
     -------
@@ -1165,9 +1307,14 @@ def gnome_vapor_pressure(gnome_oil, Ta):
     D_S = 8.75 + R_cal * np.log(Tb)
     C_2i = 0.19 * Tb - 18.
     
-    var = 1. / (Tb - C_2i) - 1. / (Ta - C_2i)
-    ln_Pi_Po = ((D_S * (Tb - C_2i) ** 2 /
-                (D_Zb * R_cal * Tb)) * var)
+    # Terms that only depend on the boiling point are the same for every 
+    # temperature
+    Tb_C_2i = Tb - C_2i
+    ln_coef = D_S * Tb_C_2i ** 2 / (D_Zb * R_cal * Tb)
+    
+    Ta = np.asarray(Ta)[..., np.newaxis]
+    var = 1. / Tb_C_2i - 1. / (Ta - C_2i)
+    ln_Pi_Po = ln_coef * var
     vapor_pressure = np.exp(ln_Pi_Po) * 101325.
     
     return vapor_pressure
@@ -1229,11 +1376,45 @@ def get_henry_constant(solubility, vapor_pressure_25C, molecular_weight):
     
     """
     # Use the definition of Henry's law constant to estimate its value in
-    # mol / (L Pa)
-    k_h_0 = solubility / vapor_pressure_25C
+    # mol / (L Pa) and convert to the units required by TAMOC (kg / (m^3 
+    # Pa)).  The conversions from g/mol to kg/mol and from L to m^3 cancel.
+    return solubility * molecular_weight / vapor_pressure_25C
+
+
+def get_dissolution_params(Tc, Pc, M):
+    """
+    Estimate the dissolution parameters of each pseudo-component
+    
+    Estimate the molar volume at infinite dilution, the enthalpy of 
+    solution, and the Setschenow constant of each pseudo-component from its
+    Peng-Robinson equation of state parameters using the correlations in 
+    Gros et al. (2018).
+    
+    Parameters
+    ----------
+    Tc : np.array
+        Critical-point temperature (K) of each pseudo-component
+    Pc : np.array
+        Critical-point pressure (Pa) of each pseudo-component
+    M : np.array
+        Molecular weight (kg/mol) of each pseudo-component
+    
+    Returns
+    -------
+    nu_bar : np.array
+        Specific volume at infinite dilution (m^3/mol)
+    neg_delta_H_sol_R : np.array
+        Negative of the enthalpy of solution divided by the ideal gas 
+        constant (K)
+    K_salt : np.array
+        Setschenow constant (m^3/mol)
     
-    # Return the result in units required by TAMOC (kg / (m^3 Pa))
-    return k_h_0 * (molecular_weight / 1000.) * 1000.
+    """
+    nu_bar = (-2.203e-5 * Pc + 518.6 * M + 143.4) * 1.e-6
+    neg_delta_H_sol_R = 2.637 * Tc + 22.48e6 * nu_bar + 314.6
+    K_salt = (-1.345 * M + 2799.4 * nu_bar +  0.083556) / 1000.
+    
+    return (nu_bar, neg_delta_H_sol_R, K_salt)
 
 
 def get_preos_params(Tb, M, rho):
@@ -1310,9 +1491,10 @@ def get_preos_params(Tb, M, rho):
     Tb = Tb * 9. / 5. # K to R
     
     # Use Equation (1) in Twu (1983) to estimate the critical temperature in 
-    # Rankine
-    Tc_0 = Tb / (0.533272 + (Tb * 0.191017e-3) + (Tb**2 * 0.779681e-7) +
-        - (Tb**3 * 0.284376e-10) + 0.959468e28 / Tb**13)
+    # Rankine.  The cubic polynomial in Tb is evaluated by Horner's scheme.
+    Tb_3 = Tb * Tb * Tb
+    Tc_0 = Tb / (0.533272 + Tb * (0.191017e-3 + Tb * (0.779681e-7 - 
+        Tb * 0.284376e-10)) + 0.959468e28 / (Tb_3 * Tb_3 * Tb_3 * Tb_3 * Tb))
     
     # Equation (5) in Twu (1983) estimates a parameter alpha
     alpha = 1. - Tb / Tc_0
@@ -1332,69 +1514,29 @@ def get_preos_params(Tb, M, rho):
     sg_twu = 0.843593 - 0.128624 * alpha - 3.36159 * alpha**3 + \
         - 13749.5 * alpha**12
     
-    # Equation (4) in Twu (1983) is used to estimate the molecular weight, 
-    # but this equation cannot be solved directly.  Write a function that 
-    # can be used with a root-finding method to obtain the molecular
-    # weight
-    def twu_eq4(theta, Tb):
-        """
-        Function containing Equation (4) in Twu (1983)
-        
-        This function is used to compute the molecular weight using a root-
-        finding algorithm.
-        
-        Parameters
-        ----------
-        theta : float
-            Estimate for the log of the molecular weight, ln(M).
-        Tb : float
-            Estimate for the boiling point (R).
-        
-        Returns
-        -------
-        Residual of Equation (4) in Twu (1983) appropriate for use to compute
-        theta from a root-finding algorithm.
-        
-        """
-        # Compute Equation (4) in Twu (1983) in a form useful for a root-
-        # finding algorithm.
-        residual = np.exp(5.71419 + 2.71579 * theta - 0.286590 * 
-            theta**2 - 39.8544 / theta - 0.122488 / theta**2) - 24.7522 * \
-            theta + 35.3155 * theta**2 - Tb
-        
-        return residual
-    
-    # Initialize an array to hold the results
-    M_twu = np.zeros(M.shape)
+    # Equation (4) in Twu (1983) estimates the molecular weight, but the
+    # molecular weight of each pseudo-component is already known (M); hence,
+    # this implicit equation is not solved here.
     
-    # Estimate the molecular weight of each pseudocomponent
-    for i in range(len(M)):
-        
-        # Equation (7) in Twu (1983) gives an appropriate initial guess
-        M_0 = Tb[i] / (10.44 - 0.0052 * Tb[i])
-        
-        # Use fsolve() to solve Equation (4) in Two (1983)
-        theta = fsolve(twu_eq4, np.log(M_0), args=(Tb[i],))
-        
-        # Convert theta to molecular weight
-        M_twu[i] = np.exp(theta)
+    # The corrections in Twu (1983) all depend on 1 / sqrt(Tb)
+    inv_sqrt_Tb = 1. / np.sqrt(Tb)
     
     # Apply Equations (11) - (13) in Twu (1983)
     delta_sg_t = np.exp(5. * (sg_twu - sg_adios)) - 1.
-    f_T = delta_sg_t * (-0.362456 / np.sqrt(Tb) + 
-        (0.0398285 - 0.948125 / np.sqrt(Tb)) * delta_sg_t)
+    f_T = delta_sg_t * (-0.362456 * inv_sqrt_Tb + 
+        (0.0398285 - 0.948125 * inv_sqrt_Tb) * delta_sg_t)
     Tc = Tc_0 * ((1. + 2. * f_T) / (1. - 2. * f_T))**2
     
     # Apply Equations (14) - (16) in Twu (1983)
     delta_sg_v = np.exp(4. * (sg_twu**2 - sg_adios**2)) - 1.
-    f_V = delta_sg_v*(0.466590 / np.sqrt(Tb) +
-        (-0.182421 + 3.01721 / np.sqrt(Tb)) * delta_sg_v)
+    f_V = delta_sg_v*(0.466590 * inv_sqrt_Tb +
+        (-0.182421 + 3.01721 * inv_sqrt_Tb) * delta_sg_v)
     Vc = Vc_0 * ((1. + 2. * f_V) / (1. - 2. * f_V))**2
     
     # Apply Equations (17) - (19) in Twu (1983)
     delta_sg_p = np.exp(0.5 * (sg_twu - sg_adios)) - 1.
-    f_P = delta_sg_p * (2.53262 - 46.1955 / np.sqrt(Tb) - 0.00127885*Tb +
-        (-11.4277 + 252.140 / np.sqrt(Tb) + 0.00230535 * Tb) * delta_sg_p)
+    f_P = delta_sg_p * (2.53262 - 46.1955 * inv_sqrt_Tb - 0.00127885*Tb +
+        (-11.4277 + 252.140 * inv_sqrt_Tb + 0.00230535 * Tb) * delta_sg_p)
     Pc = Pc_0 * Tc / Tc_0 * Vc_0 / Vc * ((1. + 2. * f_P) / (1. - 2. * f_P))**2
     
     # Second, we apply correlations in Chen et al. (1993) --------------------
@@ -1462,17 +1604,13 @@ def pedersen(M, composition=[]):
         Array of binary interaction coefficients
     
     """
-    # Initialize a matrix to hold delta
-    delta = np.zeros((len(M), len(M)))
-    
     # Compute each off-diagonal term using the correlation to hydrocarbon-
-    # hydrocarbon mixtures.
-    for i in range(len(M)):
-        for j in range(len(M)):
-            if i != j:
-                # Take the appropriate ratio
-                delta[i,j] = 0.00145 * np.max(np.array([M[j] / M[i], 
-                    M[i] / M[j]]))
+    # hydrocarbon mixtures.  Here, M_ratio[i,j] = M[j] / M[i], and we take
+    # the larger of M[j] / M[i] and M[i] / M[j].
+    M = np.asarray(M)
+    M_ratio = M[np.newaxis,:] / M[:,np.newaxis]
+    delta = 0.00145 * np.maximum(M_ratio, M_ratio.transpose())
+    np.fill_diagonal(delta, 0.)
     
     # Next, make corrections based on the given composition
     if len(composition) > 0:
@@ -1492,14 +1630,20 @@ def pedersen(M, composition=[]):
         # Get the values of data between air and longer-chain hydrocarbons
         delta_air_hydro = np.array([0.08, 0.08, 0.01])
         
+        # Index the position of each compound in the composition (the first
+        # one, if a compound is listed more than once)
+        comp_idx = {}
+        for i, name in enumerate(composition):
+            comp_idx.setdefault(name, i)
+        
         # For each atmospheric gas, correct the delta values
         for i in range(len(air)):
             
             # Only correct components in the composition
-            if air[i] in composition:
+            if air[i] in comp_idx:
                 
                 # Get the index to this gas in the composition
-                air_idx = composition.index(air[i])
+                air_idx = comp_idx[air[i]]
                 
                 # Set all binary interaction parameters to the value between
                 # this gas and a hydrocarbon
@@ -1512,46 +1656,108 @@ def pedersen(M, composition=[]):
                 for j in range(len(gas)):
                     
                     # Only correct components in the composition
-                    if gas[j] in composition:
+                    if gas[j] in comp_idx:
                         
                         # Get the  index to this natural gas compound in 
                         # the composition
-                        gas_idx = composition.index(gas[j])
+                        gas_idx = comp_idx[gas[j]]
                         
                         # Set these binary interaction coefficients to the 
                         # correct values
                         delta[air_idx,gas_idx] = delta_air_gas[i,j]
                         delta[gas_idx,air_idx] = delta_air_gas[i,j]
         
-        # Set the names of known compounds
+        # Set the names of known compounds.  Note that component names look
+        # like 'Aromatics5', so we have to search for the base name 
+        # 'Aromatics' anywhere in the compound name.
         chems = ['Saturates', 'Aromatics', 'Resins', 'Asphaltenes'] + air + \
             gas
+        known_chems = re.compile('|'.join(re.escape(chem) for chem in chems))
         
-        # For any other components of the mixture, set the delta values to 
-        # zero
-        for i in range(len(composition)):
-            
-            # Check if we recognize this chemical
-            known = False
-            for j in range(len(chems)):
-                # Note that component names look like 'Aromatics5', so
-                # we have to check whether the base name 'Aromatics' is
-                # in this compound name
-                if chems[j] in composition[i]:
-                    known = True
-            
-            # Set delta to zero for unknown chemicals
-            if not known:
-                # This compound does not have a base name common with any
-                # compound in chems...set these binary interaction parameters 
-                # to zero
-                delta[i,:] = 0.
-                delta[:,i] = 0.
+        # Find the components of the mixture that do not have a base name 
+        # common with any compound in chems
+        unknown = np.array([known_chems.search(name) is None 
+            for name in composition], dtype=bool)
+        
+        # Set the binary interaction parameters of these unknown chemicals 
+        # to zero
+        delta[unknown,:] = 0.
+        delta[:,unknown] = 0.
     
     # Return the result
     return delta
 
 
+def finalize_oil(mass_frac, composition, T_0, rho_0, w_0, rho_i, delta, 
+    user_data, units):
+    """
+    Tune the oil property data and format the results of an oil loader
+    
+    Performs the steps shared by all of the functions that convert an oil
+    from another database to TAMOC:  Vc is tuned to match the measured 
+    densities, Vb is updated from the tuned values of Vc, and the results 
+    are returned in the format of ``load_tamoc_oil``.
+    
+    Parameters
+    ----------
+    mass_frac : np.array
+        Array of mass fractions of the dead oil compounds in the mixture.
+    composition : list
+        List of strings containing unique names for each chemical in the 
+        present oil composition.
+    T_0 : np.array
+        Temperatures at which the whole-oil density was evaluated (K)
+    rho_0 : np.array
+        Densities reported for the whole-oil (kg/m^3)
+    w_0 : np.array
+        Array of weathering states for the density data (--)
+    rho_i : np.array
+        Array of densities of each pseudo-component, re-scaled such that 
+        density whole oil = (1./np.sum(mass_frac/rho_i))
+    delta : np.array
+        Array of binary interaction coefficients
+    user_data : dict
+        A dictionary of chemical property data in the format expected by 
+        the tamoc.dbm module objects.
+    units : dict
+        A dictionary of units for each chemical component in the mixture in
+        the format expected by the tamoc.dbm module objects.
+    
+    Returns
+    -------
+    composition : list
+        List of strings containing unique names for each chemical in the 
+        present oil composition.
+    mass_frac : np.array
+        Array of mass fractions of the dead oil compounds in the mixture.
+    user_data : dict
+        A dictionary of the tuned chemical property data.
+    delta : np.array
+        Array of binary interaction coefficients
+    delta_groups : None
+        The group contribution methods are not used for these oils
+    units : dict
+        A dictionary of units for each chemical property.
+    
+    """
+    # Perform tuning of Vc to get better densities
+    user_data = Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, rho_i,
+        delta, user_data)
+    
+    # Update the value of Vb in the user_data database using the final 
+    # value of Vc after tuning.
+    Vb = compute_Vb(np.array([user_data[name]['Vc'] for name in composition]))
+    for name, Vb_i in zip(composition, Vb):
+        user_data[name]['Vb'] = Vb_i
+    
+    # We do not use the group contribution methods for the binary interaction
+    # coefficients
+    delta_groups = None
+    
+    # Return the results
+    return (composition, mass_frac, user_data, delta, delta_groups, units)
+
+
 def compute_Vb(Vc):
     """
     Compute the molar volume at the boiling point
@@ -1571,7 +1777,58 @@ def compute_Vb(Vc):
         Specific molar volume at the boiling point (m^3/mol)
     
     """
-    return (0.285 * (Vc * 1.e6)**1.048) * 1.e-6
+    return _TYN_CALUS_COEF * Vc**1.048
+
+
+def _delta_rho(Vc, oil_comp, rho_i, T, P):
+    """
+    Compute the density difference between TAMOC and a measurement
+    
+    Compute the density of a single oil component in TAMOC and compare
+    this density to a reported measured value.  This is the objective 
+    function minimized for each oil component by `Vc_tuning`.
+    
+    Parameters
+    ----------
+    Vc : float
+        Value of the molar specific volume at the critical point 
+        (m^3/mol)
+    oil_comp : dbm.FluidMixture
+        A dbm.FluidMixture object for the oil pseudocomponent to compute.
+        Its value of Vc is replaced by the input value `Vc`.
+    rho_i : float
+        Measured value of the density of this pseudocomponent (kg/m^3)
+    T : float
+        Temperature at which to compute properties (K)
+    P : float
+        Pressure at which to compute properties (Pa)
+    
+    Returns
+    -------
+    delta_rho : float
+        Absolute value of the difference between the density computed in 
+        TAMOC and the density measured in the Adios database, re-scaled 
+        such that:
+            density whole oil = (1./np.sum(mass_fraction/rho_i))
+    
+    Notes
+    -----
+    Since this function computes the density of a single oil component, 
+    the binary interaction coefficient is zero and the parameter `delta`
+    is not needed by this function.
+    
+    """
+    # Update the value of Vc for the present oil component.  Vc only 
+    # enters the density through the volume translation, so the 
+    # dbm.FluidMixture object does not need to be rebuilt.
+    oil_comp.Vc[:] = Vc
+    
+    # Compute the density in TAMOC and select the liquid density
+    rho_tamoc = oil_comp.density(np.array([1.]), T, P)[1,0]
+    
+    # Return the absolute value of the difference between the TAMOC and 
+    # Adios densities
+    return np.abs(rho_tamoc - rho_i)
 
 
 def Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, rho_i, delta,
@@ -1620,103 +1877,44 @@ def Vc_tuning(mass_frac, composition, T_0, rho_0, w_0, rho_i, delta,
     T = 288.15
     P = 101325.
         
-    # Create a function for optimizing Vc such that the difference between
-    # the TAMOC pseudocomponent density and the reported pseudocomponent
-    # density is minimized
-    def delta_rho(Vc, component, user_data, rho_i, T, P):
-        """
-        Compute the density difference between TAMOC and a measurement
-        
-        Compute the density of a single oil component in TAMOC and compare
-        this density to a reported measured value.
-        
-        Parameters
-        ----------
-        Vc : float
-            Value of the molar specific volume at the critical point 
-            (m^3/mol)
-        component : str
-            String name of the oil pseudocomponent to compute.
-        user_data : dict
-            A dictionary of chemical property data in the format expected by 
-            the tamoc.dbm module objects.
-        rho_i : float
-            Measured value of the density of this pseudocomponent (kg/m^3)
-        T : float
-            Temperature at which to compute properties (K)
-        P : float
-            Pressure at which to compute properties (Pa)
-        
-        Returns
-        -------
-        delta_rho : float
-            Absolute value of the difference between the density computed in 
-            TAMOC and the density measured in the Adios database, re-scaled 
-            such that:
-                density whole oil = (1./np.sum(mass_fraction/rho_i))
-        
-        Notes
-        -----
-        Since this function computes the density of a single oil component, 
-        the binary interaction coefficient is zero and the parameter `delta`
-        is not needed by this function.
-        
-        """
-        # Update the value of Vc in the user_data for the present oil 
-        # component
-        user_data[component]['Vc'] = Vc
-        
-        # Create a dbm.FluidMixture object for this oil component with the
-        # present user data.
-        oil_comp = dbm.FluidMixture(component, user_data=user_data)
-        
-        # Compute the density in TAMOC and select the liquid density
-        rho_tamoc = oil_comp.density(np.array([1.]), T, P)[1,0]
-        
-        # Return the absolute value of the difference between the TAMOC and 
-        # Adios densities
-        return np.abs(rho_tamoc - rho_i)
-    
     # Find the optimal value of Vc for each component of the oil
     for i in range(nc):
         
         # Extract the original value of Vc as initial value for the search
         Vc_0 = user_data[composition[i]]['Vc']
         
+        # Create a dbm.FluidMixture object for this oil component
+        oil_comp = dbm.FluidMixture(composition[i], user_data=user_data)
+        
         # Minimize the error between the model and measurement
-        Vc = fmin(delta_rho, Vc_0, args=(composition[i], user_data, rho_i[i],
-            T, P), disp=0)[0]
+        Vc = fmin(_delta_rho, Vc_0, args=(oil_comp, rho_i[i], T, P), 
+            disp=0)[0]
         
         # Store the optimized value in user_data
         user_data[composition[i]]['Vc'] = Vc
     
     # Compare the TAMOC predictions to each of the measurements in Adios that
     # ignore weathering.
-    num = 0.
-    sum_abs = 0.
-    sum_rel = 0.
+    unweathered = np.asarray(w_0) == 0.
+    T_unw = np.asarray(T_0)[unweathered]
+    rho_adios = np.asarray(rho_0)[unweathered]
+    rho_tamoc = np.zeros(len(T_unw))
     oil = dbm.FluidMixture(composition, user_data=user_data, delta=delta)
-    for i in range(len(rho_0)):
-        if w_0[i] == 0.:
-            # Compute the whole-oil density in TAMOC
-            rho_tamoc = oil.density(mass_frac, T_0[i], P)[1,0]
-            rho_adios = rho_0[i]
-            
-            # Print the comparisons
-            print('\n    Density estimates with new TAMOC oil:')
-            print('    -->Measured density at %g K:  %g' % (T_0[i], 
-                rho_0[i]))
-            print('    -->Computed density at %g K:  %g\n' % (T_0[i], 
-                rho_tamoc))
-            
-            # Update statistics
-            sum_abs += np.abs(rho_tamoc - rho_adios)
-            sum_rel += np.abs(rho_tamoc - rho_adios) / rho_adios
-            num += 1.
+    for i in range(len(T_unw)):
+        # Compute the whole-oil density in TAMOC
+        rho_tamoc[i] = oil.density(mass_frac, T_unw[i], P)[1,0]
+        
+        # Print the comparisons
+        print('\n    Density estimates with new TAMOC oil:')
+        print('    -->Measured density at %g K:  %g' % (T_unw[i], 
+            rho_adios[i]))
+        print('    -->Computed density at %g K:  %g\n' % (T_unw[i], 
+            rho_tamoc[i]))
     
     # Compute statistics...can be printed if interested.
-    err_abs = sum_abs / num
-    err_rel = sum_rel / num
+    if len(T_unw) > 0:
+        err_abs = np.mean(np.abs(rho_tamoc - rho_adios))
+        err_rel = np.mean(np.abs(rho_tamoc - rho_adios) / rho_adios)
     
     # Return the optimized user_data dictionary
     return user_data
@@ -1871,27 +2069,27 @@ def print_petroleum_props(comp, mass_frac, data, delta, delta_groups, T, S,
     
     # Get the properties of gas
     mf_gas = m[0,:]   # mass fractions of all compounds in the gas phase
-    rho = oil.density(mf_gas, T, P)[0,0]
+    rho_gas = oil.density(mf_gas, T, P)[0,0]
     mu = oil.viscosity(mf_gas, T, P)[0,0]
     sigma = oil.interface_tension(mf_gas, T, S, P)[0,0]
     
     # Print a table to properties
     print('\nGas Properties:')
     print('---------------')
-    print('    density (kg/m^3)        : ', rho)
+    print('    density (kg/m^3)        : ', rho_gas)
     print('    viscosity (Pa s)        : ', mu)
     print('    interface tension (N/m) : ', sigma)
 
     # Get the properties of the oil
     mf_oil = m[1,:]   # mass fractions of all compounds in the liquid phase
-    rho = oil.density(mf_oil, T, P)[1,0]
+    rho_oil = oil.density(mf_oil, T, P)[1,0]
     mu = oil.viscosity(mf_oil, T, P)[1,0]
     sigma = oil.interface_tension(mf_oil, T, S, P)[1,0]
     
     # Print a table to properties
     print('\nOil Properties:')
     print('---------------')
-    print('    density (kg/m^3)        : ', rho)
+    print('    density (kg/m^3)        : ', rho_oil)
     print('    viscosity (Pa s)        : ', mu)
     print('    interface tension (N/m) : ', sigma)
     
@@ -1905,27 +2103,27 @@ def print_petroleum_props(comp, mass_frac, data, delta, delta_groups, T, S,
     if q_oil == None:
         mass_flux = mass_frac
     else:
-        mass_flux = set_mass_fluxes(comp, mass_frac, data, delta, q_oil)
+        mass_flux = set_mass_fluxes(comp, mass_frac, data, delta, 
+            delta_groups, q_oil, 1, oil)
     
-    # Compute the volume flow rates at the release
-    m, xi, K = oil.equilibrium(mass_flux, T, P)
-    p_gas = oil.density(m[0,:], T, P)[0,0]
-    md_gas = np.sum(m[0,:])
-    q_gas = md_gas / p_gas
-    p_oil = oil.density(m[1,:], T, P)[1,0]
-    md_oil = np.sum(m[1,:])
-    q_oil = md_oil / p_oil
+    # The mass flux only rescales the mass fractions, so the equilibrium 
+    # above scales by the same factor and the phase densities are unchanged
+    k_fac = np.sum(mass_flux) / np.sum(mass_frac)
+    md_gas = np.sum(m[0,:]) * k_fac
+    q_gas = md_gas / rho_gas
+    md_oil = np.sum(m[1,:]) * k_fac
+    q_oil = md_oil / rho_oil
     
     # Print a table or properties
     print('\nIn Situ Volume Flow Rates:')
     print('--------------------------')
     print('    gas flow rate (m^3/s)   : ', q_gas)
-    print('    gas flow rate (ft^3/d)  : ', q_gas * 86400. / 0.0283168)
+    print('    gas flow rate (ft^3/d)  : ', q_gas * 86400. / M3_PER_FT3)
     print('\n    oil flow rate (m^3/s)   : ', q_oil)
-    print('    oil flow rate (bbl/d)   : ', q_oil * 86400. / 0.158987)
+    print('    oil flow rate (bbl/d)   : ', q_oil * 86400. / M3_PER_BBL)
     print('\n    GOR (m^3/m^3)           : ', q_gas / q_oil)
-    print('    GOR (ft^3/bbl)          : ', (q_gas / 0.0283168) /
-                                            (q_oil / 0.158987))
+    print('    GOR (ft^3/bbl)          : ', (q_gas / M3_PER_FT3) /
+                                            (q_oil / M3_PER_BBL))
     
     # Return the oil composition with the correct flow rates
     return mass_flux
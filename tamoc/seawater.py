@@ -18,6 +18,12 @@ import numpy as np
 # Define some universal constants
 g = 9.81       # Acceleration of gravity (m/s^2)
 
+# Fit coefficients for the viscosity of seawater in Sharqawy et al. (2010)
+_MU_COEFS = (1.5700386464E-01, 6.4992620050E+01, -9.1296496657E+01,
+             4.2844324477E-05, 1.5409136040E+00, 1.9981117208E-02,
+             -9.5203865864E-05, 7.9739318223E+00, -7.5614568881E-02,
+             4.7237011074E-04)
+
 def density(T, S, P):
     """
     Computes the density of seawater from Gill (1982)
@@ -30,71 +36,108 @@ def density(T, S, P):
     
     Parameters
     ----------
-    T : float
+    T : float or ndarray
         temperature (K)
-    S : float
+    S : float or ndarray
         salinity (psu)
-    P : float
+    P : float or ndarray
         pressure (Pa)
     
     Returns
     -------
-    rho : float
+    rho : float or ndarray
         seawater density (kg/m^3)
     
-    """
-    if T < 273.15 + 40:
-        # Convert T to dec C and P to bar
-        T = T - 273.15
-        P = P * 1.e-5
-    
-        # Compute the density at atmospheric pressure
-        rho_sw_0 = (
-                    999.842594 + 6.793952e-2 * T - 9.095290e-3 * T**2 
-                    + 1.001685e-4 * T**3 - 1.120083e-6 * T**4 + 6.536332e-9 * T**5 
-                    + 8.24493e-1 * S - 5.72466e-3 * S**(3./2.) + 4.8314e-4 * S**2 
-                    - 4.0899e-3 * T*S + 7.6438e-5 * T**2 * S - 8.2467e-7 * T**3 * 
-                    S + 5.3875e-9 * T**4 * S + 1.0227e-4 * T * S**(3./2.) 
-                    - 1.6546e-6 * T**2 * S**(3./2.)
-                    )
-    
-        # Compute the pressure correction coefficient
-        K = (
-             19652.21 + 148.4206 * T - 2.327105 * T**2 + 1.360477e-2 * T**3 
-             - 5.155288e-5 * T**4 + 3.239908 * P + 1.43713e-3 * T * P 
-             + 1.16092e-4 * T**2 * P - 5.77905e-7 * T**3 * P 
-             + 8.50935e-5 * P**2 - 6.12293e-6 * T * P**2 
-             + 5.2787e-8 * T**2 * P**2 + 54.6746 * S - 0.603459 * T * S 
-             + 1.09987e-2 * T**2 * S - 6.1670e-5 * T**3 * S 
-             + 7.944e-2 * S**(3./2.) + 1.64833e-2 * T * S**(3./2.) 
-             - 5.3009e-4 * T**2 * S**(3./2.) + 2.2838e-3 * P * S 
-             - 1.0981e-5 * T * P * S - 1.6078e-6 * T**2 * P * S 
-             + 1.91075e-4 * P * S**(3./2.) - 9.9348e-7 * P**2 * S 
-             + 2.0816e-8 * T * P**2 * S + 9.1697e-10 * T**2 * P**2 * S
-             )
-        
-        rho = rho_sw_0 / (1 - P / K)
+    Notes
+    -----
+    If any of the inputs are arrays, they are broadcast against each other 
+    and the density is returned for each element, with the equation of state
+    chosen separately for each temperature.
     
+    """
+    if not isinstance(T, np.ndarray):
+        # Select the equation of state valid for this temperature
+        if T < 273.15 + 40:
+            return _density_gill(T, S, P)
+        else:
+            return _density_sun(T, S, P)
+    
+    # Evaluate only the equations of state needed by these temperatures
+    cold = T < 273.15 + 40
+    if np.all(cold):
+        return _density_gill(T, S, P)
+    elif not np.any(cold):
+        return _density_sun(T, S, P)
     else:
-        # Convert T to deg C and P to MPa
-        T = T - 273.15
-        P = P / 1.e6
-        
-        # Summations
-        left_col = 9.9920571e2 + 9.5390097e-2 * T - 7.6186636e-3 * T**2 + \
-            3.1305828e-5 * T**3 - 6.1737704e-8  * T**4 + 4.3368858e-1 * P + \
-            2.5495667e-5 * P*T**2 - 2.8988021e-7 * P*T**3 + \
-            9.5784313e-10 * P*T**4 + 1.7627497e-3 * P**2 - 1.2312703e-4 * P**2*T \
-            + 1.3659381e-6 * P**2*T**2 + 4.0454583e-9 * P**2*T**3 - 1.4673241e-5 \
-            * P**3 + 8.8391585e-7 * P**3*T - 1.1021321e-9 * P**3*T**2 + \
-            4.2472611e-11 * P**3*T**3 - 3.9591772e-14 * P**3*T**4
-        right_col = -7.99992230e-1 * S + 2.40936500e-3 * S*T - 2.58052775e-5 * \
-            S*T**2 + 6.85608405e-8 * S*T**3 + 6.29761106e-4 * P*S - \
-            9.36263713e-7 * P**2*S
-        
-        rho = left_col - right_col
+        return np.where(cold, _density_gill(T, S, P), _density_sun(T, S, P))
+
+def _density_gill(T, S, P):
+    """
+    Density of seawater from Gill (1982) for temperatures below 40 deg C
     
-    return rho
+    See ``density`` for details.  The polynomials are evaluated by Horner's
+    scheme in temperature, and S**(3/2) is computed once.
+    
+    """
+    # Convert T to dec C and P to bar
+    T = T - 273.15
+    P = P * 1.e-5
+    S_32 = S**1.5
+    
+    # Compute the density at atmospheric pressure
+    rho_sw_0 = (
+        999.842594 + T * (6.793952e-2 + T * (-9.095290e-3 + T * (1.001685e-4 
+        + T * (-1.120083e-6 + T * 6.536332e-9)))) 
+        + S * (8.24493e-1 + T * (-4.0899e-3 + T * (7.6438e-5 + T * 
+        (-8.2467e-7 + T * 5.3875e-9)))) 
+        + S_32 * (-5.72466e-3 + T * (1.0227e-4 - T * 1.6546e-6)) 
+        + 4.8314e-4 * S * S
+        )
+    
+    # Compute the pressure correction coefficient
+    K = (
+        19652.21 + T * (148.4206 + T * (-2.327105 + T * (1.360477e-2 - 
+        T * 5.155288e-5))) 
+        + P * (3.239908 + T * (1.43713e-3 + T * (1.16092e-4 - 
+        T * 5.77905e-7))) 
+        + P * P * (8.50935e-5 + T * (-6.12293e-6 + T * 5.2787e-8)) 
+        + S * (54.6746 + T * (-0.603459 + T * (1.09987e-2 - T * 6.1670e-5))) 
+        + S_32 * (7.944e-2 + T * (1.64833e-2 - T * 5.3009e-4)) 
+        + P * S * (2.2838e-3 + T * (-1.0981e-5 - T * 1.6078e-6)) 
+        + 1.91075e-4 * P * S_32 
+        + P * P * S * (-9.9348e-7 + T * (2.0816e-8 + T * 9.1697e-10))
+        )
+    
+    return rho_sw_0 / (1 - P / K)
+
+def _density_sun(T, S, P):
+    """
+    Density of seawater from Sun et al. (2008) for temperatures above 40 C
+    
+    See ``density`` for details.  The polynomials are evaluated by Horner's
+    scheme in temperature and pressure.
+    
+    """
+    # Convert T to deg C and P to MPa
+    T = T - 273.15
+    P = P / 1.e6
+    
+    # Summations
+    left_col = (
+        9.9920571e2 + T * (9.5390097e-2 + T * (-7.6186636e-3 + T * 
+        (3.1305828e-5 - T * 6.1737704e-8))) 
+        + P * (4.3368858e-1 + T * T * (2.5495667e-5 + T * (-2.8988021e-7 + 
+        T * 9.5784313e-10)) 
+        + P * (1.7627497e-3 + T * (-1.2312703e-4 + T * (1.3659381e-6 + 
+        T * 4.0454583e-9)) 
+        + P * (-1.4673241e-5 + T * (8.8391585e-7 + T * (-1.1021321e-9 + 
+        T * (4.2472611e-11 - T * 3.9591772e-14))))))
+        )
+    right_col = S * (-7.99992230e-1 + T * (2.40936500e-3 + T * 
+        (-2.58052775e-5 + T * 6.85608405e-8)) + P * (6.29761106e-4 - 
+        9.36263713e-7 * P))
+    
+    return left_col - right_col
 
 def mu(T, S, P):
     """
@@ -124,23 +167,21 @@ def mu(T, S, P):
     T = T - 273.15
     
     # Get the fit coefficients
-    a = np.array([1.5700386464E-01, 6.4992620050E+01, -9.1296496657E+01,
-                  4.2844324477E-05, 1.5409136040E+00, 1.9981117208E-02,
-                  -9.5203865864E-05, 7.9739318223E+00, -7.5614568881E-02,
-                  4.7237011074E-04])
+    a0, a1, a2, a3, a4, a5, a6, a7, a8, a9 = _MU_COEFS
                   
     # Compute the viscosity of pure water at given temperature
-    mu_w = a[3] + 1./(a[0] * (T + a[1])**2 + a[2])
+    T_a1 = T + a1
+    mu_w = a3 + 1./(a0 * T_a1 * T_a1 + a2)
     
     # Correct for salinity
     S = S / 1000.
-    A = a[4] + a[5] * T + a[6] * T**2
-    B = a[7] + a[8] * T + a[9] * T**2
-    mu_0 = mu_w * (1. + A * S + B * S**2)
+    A = a4 + T * (a5 + T * a6)
+    B = a7 + T * (a8 + T * a9)
+    mu_0 = mu_w * (1. + S * (A + B * S))
     
     # And finally for pressure
     P = P * 0.00014503773800721815
-    mu = mu_0 * (0.9994 + 4.0295e-5 * P + 3.1062e-9 * P**2)
+    mu = mu_0 * (0.9994 + P * (4.0295e-5 + 3.1062e-9 * P))
     
     # Return the in situ dynamic viscosity
     return mu
@@ -154,14 +195,14 @@ def sigma(T, S):
     
     Parameters
     ----------
-    T : float
+    T : float or ndarray
         temperature (K)
-    S : float
+    S : float or ndarray
         salinity (psu)
     
     Returns
     -------
-    sigma : float
+    sigma : float or ndarray
         interfacial tension of air in seawater (N/m)
     
     """
@@ -173,14 +214,17 @@ def sigma(T, S):
     sigma_w = 0.2358 * (1. - (T + 273.15) / 647.096)**1.256 * (1. - 0.625 * 
               (1. - (T + 273.15) / 647.096))
     
-    # Equation (28) gives the salinity correction
-    if T < 40:
-        # Salinity correction only valid [0, 40] deg C
-        sigma = sigma_w * (1. + (0.000226 * T + 0.00946) * np.log(1. + 0.0331 * 
-                S))
+    # Equation (28) gives the salinity correction, which is only valid 
+    # [0, 40] deg C; there is no available salinity correction for hot cases
+    if not isinstance(T, np.ndarray) and not isinstance(S, np.ndarray):
+        if T < 40:
+            sigma = sigma_w * (1. + (0.000226 * T + 0.00946) * 
+                    np.log1p(0.0331 * S))
+        else:
+            sigma = sigma_w
     else:
-        # No available salinity correction for hot cases
-        sigma = sigma_w
+        sigma = sigma_w * (1. + np.where(T < 40, (0.000226 * T + 0.00946) * 
+                np.log1p(0.0331 * S), 0.))
     
     return sigma
 
@@ -194,16 +238,16 @@ def k(T, S, P):
     
     Parameters
     ----------
-    T : float
+    T : float or ndarray
         temperature (K)
-    S : float
+    S : float or ndarray
         salinity (psu)
-    P : float
+    P : float or ndarray
         pressure (Pa)
     
     Returns
     -------
-    k : float
+    k : float or ndarray
         thermal conductivity of seawater (W/(mK))
     
     Notes
@@ -223,18 +267,47 @@ def k(T, S, P):
     P = P * 1e-6
     
     # Compute the thermal conductivity from Table 4
-    if T_68 < 30.:
-        # Equation (15)
-        k_sw = 0.55286 + 3.4025e-4 * P + 1.8364e-3 * T_68 - 3.3058e-7 * \
-               T_68**3
-        
+    if not isinstance(T_68, np.ndarray) and not isinstance(S, np.ndarray) \
+        and not isinstance(P, np.ndarray):
+        if T_68 < 30.:
+            return _k_eq15(T_68, S, P)
+        else:
+            return _k_eq13(T_68, S, P)
+    
+    # Each equation depends on only some of the inputs, so broadcast them 
+    # to the shape of the result before evaluating only the equations 
+    # needed by these temperatures
+    T_68, S, P = np.broadcast_arrays(T_68, S, P)
+    cold = T_68 < 30.
+    if np.all(cold):
+        return _k_eq15(T_68, S, P)
+    elif not np.any(cold):
+        return _k_eq13(T_68, S, P)
     else:
-        # Equation (13)
-        k_sw = 10.**(np.log10(240. + 0.0002 * S) + 0.434 * (2.3 - (343.5 + 
-               0.037 * S) / (T_68 + 273.15)) * (1. - (T_68 + 273.15) / 
-               (647. + 0.03 * S)) ** 0.333) / 1000.
+        return np.where(cold, _k_eq15(T_68, S, P), _k_eq13(T_68, S, P))
+
+def _k_eq15(T_68, S, P):
+    """
+    Thermal conductivity of seawater from equation (15) of Sharqawy et al.
+    
+    See ``k`` for details.  Inputs are T_68 in deg C, S in g/kg, and P in 
+    MPa.
     
-    return k_sw
+    """
+    return 0.55286 + 3.4025e-4 * P + 1.8364e-3 * T_68 - 3.3058e-7 * \
+           T_68**3
+
+def _k_eq13(T_68, S, P):
+    """
+    Thermal conductivity of seawater from equation (13) of Sharqawy et al.
+    
+    See ``k`` for details.  Inputs are T_68 in deg C, S in g/kg, and P in 
+    MPa.
+    
+    """
+    return 10.**(np.log10(240. + 0.0002 * S) + 0.434 * (2.3 - (343.5 + 
+           0.037 * S) / (T_68 + 273.15)) * (1. - (T_68 + 273.15) / 
+           (647. + 0.03 * S)) ** 0.333) / 1000.
     
 def cp():
     """
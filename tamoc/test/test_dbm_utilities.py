@@ -0,0 +1,312 @@
+"""
+Unit tests for the `dbm_utilities` module of ``TAMOC``
+
+Provides testing of the functions defined in ``dbm_utilities.py`` that
+estimate the chemical properties of oil pseudo-components and load oils from
+the NOAA ADIOS database.  The ADIOS tests use the example oil records
+distributed with the ``adios_db`` package and are skipped if this package is
+not installed.
+
+Notes
+-----
+All of the tests defined herein check the general behavior of each of the
+programmed function--this is not a comparison against measured data. The
+results of the hand calculations entered below as sample solutions have been
+ground-truthed for their reasonableness. However, passing these tests only
+means the programs and their interfaces are working as expected, not that they
+have been validated against measurements.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+from tamoc import dbm, dbm_utilities
+
+import os
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_approx_equal
+
+import pytest
+
+# ----------------------------------------------------------------------------
+# Helper Functions
+# ----------------------------------------------------------------------------
+
+def get_group_mixture():
+    """
+    Create a dead oil that uses the group contribution method
+
+    Returns a `dbm.FluidMixture` object for a simple hydrocarbon mixture
+    whose binary interaction coefficients are computed from the Privat and
+    Jaubert group contributions, together with the mass fractions of its
+    components.
+
+    """
+    composition = ['methane', 'ethane', 'propane', 'n-hexane', 'n-decane']
+    delta_groups = np.zeros((5, 15))
+    delta_groups[0,4] = 1.
+    delta_groups[1,5] = 1.
+    delta_groups[2,:2] = [2., 1.]
+    delta_groups[3,:2] = [2., 4.]
+    delta_groups[4,:2] = [2., 8.]
+    masses = np.array([0.05, 0.03, 0.02, 0.4, 0.5])
+
+    return (dbm.FluidMixture(composition, delta_groups=delta_groups), masses)
+
+
+# ----------------------------------------------------------------------------
+# Unit Tests
+# ----------------------------------------------------------------------------
+
+def test_get_preos_params():
+    """
+    Test the Peng-Robinson parameters estimated for oil pseudo-components
+
+    The heaviest pseudo-component has a boiling point above about 1115 K,
+    where the initial guess in Equation (7) of Twu (1983) for the molecular
+    weight is negative.  The critical properties should still be computed
+    for this component, both alone and together with lighter components.
+
+    """
+    # A single heavy pseudo-component
+    Tc, Pc, Vc, M, omega, delta = dbm_utilities.get_preos_params(
+        np.array([1150.]), np.array([700.]), np.array([1000.]))
+    assert_array_almost_equal(Tc, np.array([1231.708429]), decimal=6)
+    assert_array_almost_equal(Vc, np.array([0.00319892]), decimal=8)
+    assert_array_almost_equal(M, np.array([0.7]), decimal=6)
+    assert_array_almost_equal(delta, np.array([[0.]]), decimal=6)
+
+    # The same pseudo-component mixed with lighter pseudo-components
+    Tb = np.array([400., 650., 1150.])
+    M = np.array([100., 350., 700.])
+    rho = np.array([750., 900., 1000.])
+    Tc, Pc, Vc, M, omega, delta = dbm_utilities.get_preos_params(Tb, M, rho)
+    assert_array_almost_equal(Tc, np.array([583.781414, 834.462383,
+        1231.708429]), decimal=6)
+    assert_array_almost_equal(Pc[:2], np.array([2749721.342409,
+        1464458.332193]), decimal=3)
+    assert_array_almost_equal(Vc, np.array([0.00045718, 0.00105264,
+        0.00319892]), decimal=8)
+    assert_array_almost_equal(M, np.array([0.1, 0.35, 0.7]), decimal=6)
+    assert_array_almost_equal(omega[:2], np.array([0.333428, 0.793966]),
+        decimal=6)
+    assert_array_almost_equal(delta, np.array([[0., 0.005075, 0.01015],
+        [0.005075, 0., 0.0029], [0.01015, 0.0029, 0.]]), decimal=6)
+
+
+def test_format_dbm_data():
+    """
+    Test formatting chemical property data for the `dbm` module
+
+    Check the dictionary of properties for each component and that property
+    arrays of the wrong length are rejected.
+
+    """
+    composition = ['comp1', 'comp2']
+    M = np.array([0.1, 0.2])
+    Pc = np.array([3.e6, 2.e6])
+    Tc = np.array([500., 600.])
+    omega = np.array([0.3, 0.5])
+    kh_0 = np.array([1.e-5, -1.])
+    neg_dH_solR = np.array([4000., 5000.])
+    nu_bar = np.array([1.e-4, 2.e-4])
+    K_salt = np.array([2.e-4, 3.e-4])
+    data, units = dbm_utilities.format_dbm_data(composition, M, Pc, Tc,
+        omega, kh_0, neg_dH_solR, nu_bar, K_salt, Vc=np.array([3.e-4,
+        6.e-4]))
+    assert sorted(data.keys()) == composition
+    assert data['comp2']['M'] == 0.2
+    assert data['comp2']['-dH_solR'] == 5000.
+    assert data['comp2']['kh_0'] == 0.
+    assert data['comp1']['Vc'] == 3.e-4
+    assert data['comp1']['Tb'] == -9999.
+
+    # Property arrays must have one value per component
+    with pytest.raises(ValueError):
+        dbm_utilities.format_dbm_data(composition, M, Pc, Tc, omega, kh_0,
+            neg_dH_solR, nu_bar, K_salt, Vc=np.array([3.e-4, 6.e-4, 9.e-4]))
+    with pytest.raises(ValueError):
+        dbm_utilities.format_dbm_data(composition, M[:1], Pc, Tc, omega,
+            kh_0, neg_dH_solR, nu_bar, K_salt)
+
+
+def test_print_petroleum_props(capsys):
+    """
+    Test `print_petroleum_props` for a given oil flow rate
+
+    Check that the mass fluxes and the in situ volume flow rates reported
+    for a live oil match those from the `dbm.FluidMixture` methods.
+
+    """
+    # Create a live oil from the TAMOC chemical properties database
+    substance={
+        'composition' : ['n-hexane', '2-methylpentane', '3-methylpentane',
+                         'neohexane', 'n-heptane', 'benzene', 'toluene',
+                         'ethylbenzene', 'n-decane'],
+        'masses' : np.array([0.04, 0.07, 0.08, 0.09, 0.11, 0.12, 0.15, 0.18,
+                             0.16])
+    }
+    composition, mass_frac, user_data, delta, delta_groups, units = \
+        dbm_utilities.load_tamoc_oil(substance)
+    composition, mass_frac, delta, delta_groups = \
+        dbm_utilities.mix_gas_for_gor(composition, mass_frac, user_data,
+        delta, delta_groups, 800.)
+
+    # Report the properties at conditions where gas and liquid both exist
+    T = 290.
+    S = 35.
+    P = 2.e6
+    q_oil = 20000.
+    mass_flux = dbm_utilities.print_petroleum_props(composition, mass_frac,
+        user_data, delta, delta_groups, T, S, P, q_oil)
+    output = capsys.readouterr().out
+
+    # The mass fluxes should give the desired oil flow rate at the surface
+    ans = dbm_utilities.set_mass_fluxes(composition, mass_frac, user_data,
+        delta, delta_groups, q_oil, 1)
+    assert_array_almost_equal(mass_flux, ans, decimal=10)
+
+    # Compute the in situ volume flow rates from the equilibrium directly
+    oil = dbm.FluidMixture(composition, delta=delta,
+        delta_groups=delta_groups, user_data=user_data)
+    m, xi, K = oil.equilibrium(mass_flux, T, P)
+    q_gas = np.sum(m[0,:]) / oil.density(m[0,:], T, P)[0,0]
+    q_liq = np.sum(m[1,:]) / oil.density(m[1,:], T, P)[1,0]
+
+    # Compare to the reported values
+    values = {}
+    for line in output.splitlines():
+        if ' flow rate (m^3/s)' in line:
+            values[line.split('flow rate')[0].strip()] = \
+                float(line.split(':')[1])
+    assert_approx_equal(values['gas'], q_gas, significant=8)
+    assert_approx_equal(values['oil'], q_liq, significant=8)
+
+def test_get_oil_delta_groups():
+    """
+    Test `get_oil` for a mixture using group contributions
+
+    Create a live oil from a user-provided `dbm.FluidMixture` object that
+    computes its binary interaction coefficients by the group contribution
+    method, adding natural gas to reach a given gas to oil ratio and
+    tracking dissolved atmospheric gases.
+
+    """
+    ca = ['nitrogen', 'carbon_dioxide']
+    q_oil = 20000.
+
+    # Track the atmospheric gases without adding natural gas
+    dead_oil, masses = get_group_mixture()
+    composition = dead_oil.composition
+    substance = {'dbm_mixture' : dead_oil, 'masses' : masses}
+    oil, mass_flux = dbm_utilities.get_oil(substance, q_oil, 0., ca)
+    assert oil.composition == composition + ca
+    assert oil.delta_groups.shape == (7, 15)
+    assert np.all(np.isfinite(oil.delta_groups))
+    assert oil.delta_groups[5,12] == 1.
+    assert oil.delta_groups[6,11] == 1.
+    assert_array_almost_equal(mass_flux, np.array([1.443668862536,
+        0.866201317522, 0.577467545014, 11.549350900289, 14.436688625362,
+        0., 0.]), decimal=6)
+
+    # Also add natural gas to reach the desired gas to oil ratio
+    dead_oil, masses = get_group_mixture()
+    substance = {'dbm_mixture' : dead_oil, 'masses' : masses}
+    oil, mass_flux = dbm_utilities.get_oil(substance, q_oil, 500., ca)
+    gas_comp = ['methane', 'ethane', 'propane', 'isobutane', 'n-butane']
+    assert oil.composition == gas_comp + composition + ca
+    assert oil.delta_groups.shape == (12, 15)
+    assert np.all(np.isfinite(oil.delta_groups))
+    assert oil.delta_groups[10,12] == 1.
+    assert oil.delta_groups[11,11] == 1.
+    assert_array_almost_equal(mass_flux, np.array([3.778333728463e-02,
+        1.689989527108e-03, 7.403763642568e-04, 1.207135376506e-05,
+        1.207135376506e-05, 1.444807657677e+00, 8.668845946062e-01,
+        5.779230630708e-01, 1.155846126142e+01, 1.444807657677e+01, 0., 0.]),
+        decimal=6)
+
+
+def test_get_oil_dbm_mixture():
+    """
+    Test `get_oil` for a user-provided dead oil mixture
+
+    Without added gas, the provided `dbm.FluidMixture` object is returned
+    as the oil; otherwise, a new object is created.
+
+    """
+    dead_oil, masses = get_group_mixture()
+    substance = {'dbm_mixture' : dead_oil, 'masses' : masses}
+    oil, mass_flux = dbm_utilities.get_oil(substance, 20000., 0.)
+    assert oil is dead_oil
+    oil, mass_flux = dbm_utilities.get_oil(substance, 20000., 500.)
+    assert oil is not dead_oil
+    oil, mass_flux = dbm_utilities.get_oil(substance, 20000., 0.,
+        ['nitrogen'])
+    assert oil is not dead_oil
+
+
+def test_get_oil_delta_groups_ca():
+    """
+    Test the dissolved gases allowed with the group contribution method
+
+    Oxygen is assigned the group of nitrogen, and argon, which has no group,
+    is rejected.
+
+    """
+    # Oxygen is tracked like nitrogen
+    dead_oil, masses = get_group_mixture()
+    substance = {'dbm_mixture' : dead_oil, 'masses' : masses}
+    oil, mass_flux = dbm_utilities.get_oil(substance, 20000., 0., ['oxygen'])
+    assert np.all(np.isfinite(oil.delta_groups))
+    assert oil.delta_groups[5,12] == 1.
+
+    # Argon cannot be tracked
+    dead_oil, masses = get_group_mixture()
+    substance = {'dbm_mixture' : dead_oil, 'masses' : masses}
+    with pytest.raises(ValueError):
+        dbm_utilities.get_oil(substance, 20000., 500., ['nitrogen', 'argon'])
+
+
+def test_load_adios_oils():
+    """
+    Test loading several ADIOS oils in parallel
+
+    Check that `load_adios_oils` returns the same oils as `load_adios_oil`
+    and that the oils it loads are stored in the calling process.
+
+    """
+    adios_db = pytest.importorskip('adios_db')
+
+    # Get two of the example oil records distributed with adios_db
+    data_dir = os.path.join(os.path.dirname(adios_db.__file__), 'test',
+        'data_for_testing', 'noaa-oil-data', 'oil', 'AD')
+    adios_ids = [os.path.join(data_dir, 'AD00010.json'),
+                 os.path.join(data_dir, 'AD00020.json')]
+    for adios_id in adios_ids:
+        if not os.path.isfile(adios_id):
+            pytest.skip('adios_db example oil records are not installed')
+
+    # Load the oils in parallel
+    oils = dbm_utilities.load_adios_oils(adios_ids, processes=2)
+    assert len(oils) == len(adios_ids)
+
+    # The results should be stored for later use in this process
+    keys = [dbm_utilities._noaa_oil_key('load_adios_oil', adios_id) for
+        adios_id in adios_ids]
+    for key in keys:
+        assert key in dbm_utilities._noaa_oils
+
+    # Compare to the oils loaded one at a time in this process
+    for key in keys:
+        del dbm_utilities._noaa_oils[key]
+    for adios_id, oil in zip(adios_ids, oils):
+        composition, mass_frac, user_data, delta, delta_groups, units = \
+            dbm_utilities.load_adios_oil(adios_id)
+        assert oil[0] == composition
+        assert_array_almost_equal(oil[1], mass_frac, decimal=10)
+        assert_array_almost_equal(oil[3], delta, decimal=10)
+        for name in composition:
+            for prop in user_data[name]:
+                assert_array_almost_equal(oil[2][name][prop],
+                    user_data[name][prop], decimal=10)
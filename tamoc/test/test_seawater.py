@@ -0,0 +1,156 @@
+"""
+Unit tests for the `seawater` module of ``TAMOC``
+
+Provides testing of the seawater property functions defined in
+``seawater.py``.  These tests check that the functions accept arrays as well
+as scalars and that each element of an array result matches the result of
+the same function called with scalar inputs.
+
+Notes
+-----
+All of the tests defined herein check the general behavior of each of the
+programmed function--this is not a comparison against measured data. The
+results of the hand calculations entered below as sample solutions have been
+ground-truthed for their reasonableness. However, passing these tests only
+means the programs and their interfaces are working as expected, not that they
+have been validated against measurements.
+
+"""
+
+from __future__ import (absolute_import, division, print_function)
+
+from tamoc import seawater
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_approx_equal
+
+# ----------------------------------------------------------------------------
+# Helper Functions
+# ----------------------------------------------------------------------------
+
+def check_elementwise(prop, *args):
+    """
+    Check that an array call of a property function matches scalar calls
+
+    Evaluate the seawater property function `prop` with the given array
+    arguments and compare each element of the result to `prop` evaluated
+    with the corresponding scalar arguments.  Arguments that are scalars are
+    broadcast against the arrays.
+
+    """
+    # Compute the property with the array inputs
+    ans = prop(*args)
+
+    # Compute the property one element at a time
+    inputs = np.broadcast_arrays(*[np.asarray(arg) for arg in args])
+    ans_scalar = np.zeros(inputs[0].shape)
+    for i in range(ans_scalar.size):
+        ans_scalar.flat[i] = prop(*[float(x.flat[i]) for x in inputs])
+
+    # The results should agree element-by-element
+    assert ans.shape == ans_scalar.shape
+    assert_array_almost_equal(ans / ans_scalar, np.ones(ans.shape),
+        decimal=14)
+
+
+# ----------------------------------------------------------------------------
+# Unit Tests
+# ----------------------------------------------------------------------------
+
+def test_density():
+    """
+    Test the seawater density for scalar and array inputs
+
+    The temperatures cross 40 deg C, where the density switches from the
+    Gill (1982) to the Sun et al. (2008) equation of state.
+
+    """
+    # Scalar inputs return a float
+    rho = seawater.density(300., 35., 101325.)
+    assert isinstance(rho, float)
+    assert_approx_equal(rho, 1022.8111564, significant=10)
+
+    # Array temperatures on both sides of 40 deg C
+    T = np.array([275., 290., 305., 313.1, 313.2, 320., 340.])
+    S = np.array([35., 34., 33., 32., 0., 20., 35.])
+    P = np.array([101325., 1.e6, 5.e6, 1.e7, 2.e7, 1.e5, 3.e7])
+    check_elementwise(seawater.density, T, S, P)
+
+    # Array temperatures all on one side of 40 deg C
+    check_elementwise(seawater.density, T[:3], 35., 101325.)
+    check_elementwise(seawater.density, T[-2:], 35., 101325.)
+
+    # Scalar temperature with array salinity and pressure
+    check_elementwise(seawater.density, 290., S, P)
+    check_elementwise(seawater.density, 320., S, 101325.)
+
+    # Zero-dimensional arrays
+    check_elementwise(seawater.density, np.array(290.), 35., 101325.)
+    check_elementwise(seawater.density, np.array(320.), np.array(35.),
+        np.array(101325.))
+
+
+def test_sigma():
+    """
+    Test the seawater surface tension for scalar and array inputs
+
+    The temperatures cross 40 deg C, above which no salinity correction is
+    applied.
+
+    """
+    # Scalar inputs return a float
+    sigma = seawater.sigma(300., 35.)
+    assert isinstance(sigma, float)
+    assert_approx_equal(sigma, 0.07168725136, significant=10)
+
+    # Array temperatures on both sides of 40 deg C
+    T = np.array([275., 290., 305., 313.1, 313.2, 320., 340.])
+    S = np.array([35., 34., 33., 32., 0., 20., 35.])
+    check_elementwise(seawater.sigma, T, S)
+
+    # Scalar temperature with array salinity
+    check_elementwise(seawater.sigma, 290., S)
+    check_elementwise(seawater.sigma, 320., S)
+
+    # Zero-dimensional arrays
+    check_elementwise(seawater.sigma, np.array(290.), 35.)
+    check_elementwise(seawater.sigma, np.array(320.), np.array(35.))
+
+
+def test_k():
+    """
+    Test the seawater thermal conductivity for scalar and array inputs
+
+    The temperatures cross 30 deg C, where the thermal conductivity switches
+    from Equation (15) to Equation (13) in Sharqawy et al. (2010).
+
+    """
+    # Scalar inputs return a float
+    k = seawater.k(300., 35., 101325.)
+    assert isinstance(k, float)
+    assert_approx_equal(k, 0.5958103834, significant=10)
+    k = seawater.k(310., 35., 101325.)
+    assert isinstance(k, float)
+    assert_approx_equal(k, 0.6259262686, significant=10)
+
+    # Array temperatures on both sides of 30 deg C
+    T = np.array([275., 290., 300., 303.1, 303.3, 320., 340.])
+    S = np.array([35., 34., 33., 32., 0., 20., 35.])
+    P = np.array([101325., 1.e6, 5.e6, 1.e7, 2.e7, 1.e5, 3.e7])
+    check_elementwise(seawater.k, T, S, P)
+
+    # Array temperatures all on one side of 30 deg C
+    check_elementwise(seawater.k, T[:3], 35., 101325.)
+    check_elementwise(seawater.k, T[-2:], 35., 101325.)
+
+    # Scalar temperature with array salinity or pressure
+    check_elementwise(seawater.k, 290., S, 101325.)
+    check_elementwise(seawater.k, 290., 35., P)
+    check_elementwise(seawater.k, 320., S, 101325.)
+    check_elementwise(seawater.k, 320., 35., P)
+
+    # Zero-dimensional arrays
+    check_elementwise(seawater.k, np.array(290.), 35., 101325.)
+    check_elementwise(seawater.k, np.array(320.), np.array(35.),
+        np.array(101325.))